@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class BlogsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.blogs"
+
+    def ready(self):
+        from apps.blogs.view_counts import view_counts
+
+        view_counts.register()
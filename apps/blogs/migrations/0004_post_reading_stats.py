@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:38
+
+from django.db import migrations, models, transaction
+
+
+CHUNK = 2000
+# Frozen copy of apps.blogs.models.reading_stats as of this migration.
+WORDS_PER_MINUTE = 200
+
+
+def reading_stats(content):
+    words = len(content.split())
+    return words, max(1, words // WORDS_PER_MINUTE)
+
+
+def backfill_reading_stats(apps, schema_editor):
+    Post = apps.get_model("blogs", "Post")
+    posts = Post.objects.using(schema_editor.connection.alias).order_by("pk")
+    last = 0
+    while True:
+        rows = list(posts.filter(pk__gt=last).values_list("pk", "content")[:CHUNK])
+        if not rows:
+            break
+        updates = []
+        for pk, content in rows:
+            word_count, reading_time = reading_stats(content)
+            updates.append(Post(pk=pk, word_count=word_count, reading_time=reading_time))
+        with transaction.atomic(using=schema_editor.connection.alias):
+            posts.bulk_update(updates, ["word_count", "reading_time"])
+        last = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+    # Each chunk commits on its own, so a large table is not rewritten in one transaction.
+    atomic = False
+
+    dependencies = [
+        ("blogs", "0003_post_feed_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="reading_time",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_reading_stats, migrations.RunPython.noop),
+    ]
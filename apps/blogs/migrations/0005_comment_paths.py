@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:41
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat, LPad
+
+
+PATH_STEP = 10
+
+
+def backfill_comment_paths(apps, schema_editor):
+    # Frozen copy of apps.blogs.models.fill_comment_paths as of this migration.
+    comments = apps.get_model("blogs", "Comment").objects.using(schema_editor.connection.alias)
+    own_id = LPad(Cast("id", CharField()), PATH_STEP, Value("0"))
+    comments.filter(path="", parent__isnull=True).update(path=own_id, depth=0)
+    parents = comments.filter(pk=OuterRef("parent_id"))
+    while comments.filter(path="", parent__path__gt="").update(
+        path=Concat(Subquery(parents.values("path")), own_id),
+        depth=Subquery(parents.values("depth")) + 1,
+    ):
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blogs", "0004_post_reading_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(blank=True, default="", editable=False, max_length=250),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["post", "path"], name="comment_thread_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["post", "depth", "path"], name="comment_root_idx"),
+        ),
+        migrations.RunPython(backfill_comment_paths, migrations.RunPython.noop),
+    ]
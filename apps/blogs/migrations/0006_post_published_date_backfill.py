@@ -0,0 +1,20 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def backfill_published_date(apps, schema_editor):
+    Post = apps.get_model("blogs", "Post")
+    Post.objects.using(schema_editor.connection.alias).filter(
+        status="published", published_date__isnull=True,
+    ).update(published_date=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blogs", "0005_comment_paths"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_published_date, migrations.RunPython.noop),
+    ]
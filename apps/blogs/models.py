@@ -1,5 +1,22 @@
 from django.conf import settings
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat, LPad
+from django.utils import timezone
+
+
+WORDS_PER_MINUTE = 200
+# Comment paths are the zero-padded ids of a comment's ancestors and its own, root first.
+PATH_STEP = 10
+MAX_COMMENT_DEPTH = 25
+
+
+def reading_stats(content):
+    """``(word_count, reading_time)`` of a post body; reading time is in whole minutes, at least one."""
+    words = len(content.split())
+    return words, max(1, words // WORDS_PER_MINUTE)
+
 
 class BlogProfile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -33,10 +50,30 @@ class Post(models.Model):
     featured_image = models.URLField(blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft')
     view_count = models.IntegerField(default=0)
+    word_count = models.PositiveIntegerField(default=0)
+    reading_time = models.PositiveIntegerField(default=1)
     published_date = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-published_date', '-id'], name='post_feed_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.word_count, self.reading_time = reading_stats(self.content)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'word_count', 'reading_time'}
+        if self.status == 'published' and self.published_date is None:
+            # The feed pages by published_date, so a published post always has one.
+            self.published_date = timezone.now()
+            if update_fields is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'published_date'}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
@@ -45,6 +82,65 @@ class Comment(models.Model):
     content = models.TextField()
     is_approved = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set once on insert; sorting by path lists every thread depth-first.
+    path = models.CharField(max_length=PATH_STEP * MAX_COMMENT_DEPTH, blank=True, default='', editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', 'path'], name='comment_thread_idx'),
+            models.Index(fields=['post', 'depth', 'path'], name='comment_root_idx'),
+        ]
+
+    def clean(self):
+        super().clean()
+        if self._state.adding and self.parent_id and self.parent.depth + 1 >= MAX_COMMENT_DEPTH:
+            raise ValidationError({'parent': f"Replies cannot be nested more than {MAX_COMMENT_DEPTH} levels deep."})
+
+    def save(self, *args, **kwargs):
+        # Depth is checked in clean(), so forms and the admin report it as a field error.
+        if not self._state.adding or self.path:
+            return super().save(*args, **kwargs)
+        parent = self.parent if self.parent_id else None
+        with transaction.atomic(using=kwargs.get('using')):
+            if parent and not parent.path:
+                self._fill_ancestor_paths(parent, kwargs.get('using') or 'default')
+            depth = parent.depth + 1 if parent else 0
+            super().save(*args, **kwargs)
+            self.path = f"{parent.path if parent else ''}{self.pk:0{PATH_STEP}d}"
+            self.depth = depth
+            type(self)._default_manager.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+
+    @classmethod
+    def _fill_ancestor_paths(cls, parent, using):
+        """Give ``parent`` and its pathless ancestors (``bulk_create`` rows not yet filled) their paths."""
+        parent.refresh_from_db(using=using, fields=['path', 'depth'])
+        chain = []
+        node = parent
+        while not node.path:
+            chain.append(node)
+            if node.parent_id is None:
+                break
+            node = node.parent
+        path, depth = (node.path, node.depth) if node.path else ('', -1)
+        for ancestor in reversed(chain):
+            path += f"{ancestor.pk:0{PATH_STEP}d}"
+            depth += 1
+            ancestor.path, ancestor.depth = path, depth
+            cls._default_manager.using(using).filter(pk=ancestor.pk).update(path=path, depth=depth)
+
+
+def fill_comment_paths(model, using='default'):
+    """Set ``path``/``depth`` on comments saved without them (``bulk_create``, old rows), one UPDATE per level."""
+    comments = model._default_manager.using(using)
+    own_id = LPad(Cast('id', CharField()), PATH_STEP, Value('0'))
+    comments.filter(path='', parent__isnull=True).update(path=own_id, depth=0)
+    parents = comments.filter(pk=OuterRef('parent_id'))
+    while comments.filter(path='', parent__path__gt='').update(
+        path=Concat(Subquery(parents.values('path')), own_id),
+        depth=Subquery(parents.values('depth')) + 1,
+    ):
+        pass
 
 
 class Like(models.Model):
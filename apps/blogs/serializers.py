@@ -1,6 +1,9 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.utils.text import slugify
 from rest_framework import serializers
-from apps.blogs.models import BlogProfile, Category
+from apps.blogs.models import BlogProfile, BookmarkList, Category, Comment, Like
 from apps.hotel.models import CustomUser
 
 
@@ -20,11 +23,10 @@ class RegisterSerializer(serializers.Serializer):
     def create(self, validated_data):
         bio = validated_data.pop('bio', None)
         validated_data.pop('password_confirm')
-        user = CustomUser.objects.create_user(**validated_data)
-        user.set_password(validated_data['password'])
-        user.save()
-        if bio:
-            BlogProfile.objects.create(user=user, bio=bio)
+        with transaction.atomic():
+            user = CustomUser.objects.create_user(**validated_data)
+            if bio:
+                BlogProfile.objects.create(user=user, bio=bio)
         return user
 
     def to_representation(self, instance):
@@ -112,6 +114,11 @@ class CategorySerializer(serializers.Serializer):
         return value
 
 
+def _related_count(model):
+    rows = model.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(total=Count('pk'))
+    return Coalesce(Subquery(rows.values('total')), 0)
+
+
 class AuthorSerializer(serializers.Serializer):
     id = serializers.IntegerField()
     username = serializers.CharField()
@@ -153,32 +160,78 @@ class PostSerializer(serializers.Serializer):
 
     @staticmethod
     def get_likes_count(obj):
-        return obj.likes.count()
+        count = getattr(obj, 'likes_total', None)
+        return obj.likes.count() if count is None else count
 
     @staticmethod
     def get_comments_count(obj):
-        return obj.comments.count()
+        count = getattr(obj, 'comments_total', None)
+        return obj.comments.count() if count is None else count
     @staticmethod
     def get_reading_time(obj):
-        words = len(obj.content.split())
-        minutes = max(1, words // 200)
-        return f"{minutes} min"
+        return f"{obj.reading_time} min"
 
     def get_is_liked_by_user(self, obj):
         user = self.context.get('request').user
         if user.is_anonymous:
             return False
+        liked = self.context.get('liked_post_ids')
+        if liked is not None:
+            return obj.pk in liked
         return obj.likes.filter(user=user).exists()
 
     def get_is_bookmarked_by_user(self, obj):
         user = self.context.get('request').user
         if user.is_anonymous:
             return False
+        bookmarked = self.context.get('bookmarked_post_ids')
+        if bookmarked is not None:
+            return obj.pk in bookmarked
         return obj.bookmarked_in.filter(user=user).exists()
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # Correlated subqueries run only for the rows of the page, unlike Count() over joined likes and comments.
+        return queryset.select_related('author', 'category').prefetch_related('tags').defer('content').annotate(
+            likes_total=_related_count(Like),
+            comments_total=_related_count(Comment),
+        )
+
+    @staticmethod
+    def user_flags_context(user, posts):
+        """``liked_post_ids``/``bookmarked_post_ids`` for a page of posts, one query each."""
+        if user.is_anonymous:
+            return {}
+        post_ids = [post.pk for post in posts]
+        return {
+            'liked_post_ids': set(
+                Like.objects.filter(user=user, post_id__in=post_ids).values_list('post_id', flat=True)
+            ),
+            'bookmarked_post_ids': set(
+                BookmarkList.posts.through.objects.filter(bookmarklist__user=user, post_id__in=post_ids)
+                .values_list('post_id', flat=True)
+            ),
+        }
+
     def to_representation(self, instance):
-        rep = super().to_representation(instance)
+        return self.finalize_representation(instance, super().to_representation(instance))
+
+    def finalize_representation(self, instance, rep):
         user = self.context.get('request').user
         if instance.status == 'draft' and instance.author != user:
             return None
         return rep
+
+
+class CommentSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    user = AuthorSerializer()
+    content = serializers.CharField()
+    depth = serializers.IntegerField()
+    created_at = serializers.DateTimeField()
+
+
+class CommentPageSerializer(serializers.Serializer):
+    after = serializers.IntegerField(min_value=0, default=0)
+    page_size = serializers.IntegerField(min_value=1, max_value=50, default=20)
+    replies = serializers.IntegerField(min_value=0, max_value=200, default=50)
@@ -1,3 +1,260 @@
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ValidationError
+from django.test import RequestFactory, TestCase, override_settings
 
-# Create your tests here.
+from apps.blogs.models import MAX_COMMENT_DEPTH, BookmarkList, Category, Comment, Like, Post, Tag
+from apps.blogs.serializers import PostSerializer
+from apps.blogs.view_counts import view_counts
+from apps.hotel.models import CustomUser
+from core.fast_serializers import fast_serializer
+from core.query_budget import budget_for, query_budget
+
+
+class FastPostSerializerParityTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username="author", first_name="Ann", last_name="Lee")
+        cls.reader = CustomUser.objects.create(username="reader")
+        category = Category.objects.create(name="Travel", slug="travel", description="d")
+        tags = [Tag.objects.create(name=name, slug=name) for name in ("sea", "food")]
+        bookmarks = BookmarkList.objects.create(user=cls.reader, name="Later")
+        for i, status in enumerate(("published", "published", "draft")):
+            post = Post.objects.create(
+                title=f"Post {i}", slug=f"post-{i}", author=cls.author, category=category if i else None,
+                content="word " * (150 * i + 10), excerpt="e", status=status,
+            )
+            post.tags.set(tags[:i])
+            if i:
+                Like.objects.create(post=post, user=cls.reader)
+                bookmarks.posts.add(post)
+            Comment.objects.create(post=post, user=cls.reader, content="c")
+
+    def test_post_serializer_matches_drf(self):
+        posts = list(Post.objects.order_by("id"))
+        for user in (AnonymousUser(), self.reader, self.author):
+            request = RequestFactory().get("/")
+            request.user = user
+            context = {"request": request}
+            with self.subTest(user=str(user)):
+                self.assertEqual(
+                    fast_serializer(PostSerializer).many(posts, context=context),
+                    [PostSerializer(post, context=context).to_representation(post) for post in posts],
+                )
+
+
+class PostDetailQueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = CustomUser.objects.create(username="budget_reader")
+        category = Category.objects.create(name="Food", slug="food", description="d")
+        cls.post = Post.objects.create(
+            title="Plov", slug="plov", author=cls.reader, category=category, content="rice " * 500,
+            excerpt="e", status="published",
+        )
+        cls.post.tags.set([Tag.objects.create(name=f"tag{i}", slug=f"tag{i}") for i in range(5)])
+
+    def setUp(self):
+        view_counts.clear()
+        self.addCleanup(view_counts.clear)
+
+    def test_post_detail_view_within_budget(self):
+        self.client.force_login(self.reader)
+        with query_budget(budget_for("apps.blogs.views.post_detail_view")):
+            response = self.client.post("/blogs/post-detail/", {"id": self.post.pk})
+        self.assertEqual(response.status_code, 200)
+
+
+class PostFeedTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = CustomUser.objects.create(username="feed_reader")
+        author = CustomUser.objects.create(username="feed_author")
+        category = Category.objects.create(name="News", slug="news", description="d")
+        tag = Tag.objects.create(name="daily", slug="daily")
+        bookmarks = BookmarkList.objects.create(user=cls.reader, name="Later")
+        for i in range(60):
+            post = Post.objects.create(
+                title=f"Feed {i}", slug=f"feed-{i}", author=author, category=category, content="word " * 300,
+                excerpt="e", status="draft" if i % 10 == 0 else "published",
+            )
+            post.tags.set([tag])
+            for user in (cls.reader, author)[: i % 3]:
+                Like.objects.create(post=post, user=user)
+            if i % 4 == 0:
+                bookmarks.posts.add(post)
+            Comment.objects.create(post=post, user=author, content="c")
+
+    def test_feed_page_matches_post_serializer_within_budget(self):
+        self.client.force_login(self.reader)
+        with query_budget(budget_for("apps.blogs.views.post_feed_view")):
+            response = self.client.get("/blogs/feed/")
+        results = response.json()["results"]
+        self.assertEqual(len(results), 50)
+        self.assertTrue(response.json()["next"])
+
+        request = RequestFactory().get("/")
+        request.user = self.reader
+        posts = Post.objects.in_bulk([post["id"] for post in results])
+        self.assertEqual(
+            results, [PostSerializer(posts[post["id"]], context={"request": request}).data for post in results]
+        )
+        self.assertNotIn("draft", {post["status"] for post in results})
+
+    def test_feed_pages_reach_every_published_post(self):
+        published = set(Post.objects.filter(status="published").values_list("id", flat=True))
+        self.assertFalse(Post.objects.filter(status="published", published_date__isnull=True).exists())
+        seen, url = [], "/blogs/feed/?page_size=7"
+        while url:
+            page = self.client.get(url).json()
+            seen.extend(post["id"] for post in page["results"])
+            url = page["next"]
+        self.assertEqual(len(seen), len(published))
+        self.assertEqual(set(seen), published)
+
+
+@override_settings(BLOG_VIEW_COUNT_FLUSH_SIZE=3, BLOG_VIEW_COUNT_FLUSH_INTERVAL=3600)
+class ViewCountBufferTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = CustomUser.objects.create(username="viewed_author")
+        cls.posts = [
+            Post.objects.create(
+                title=f"Viewed {i}", slug=f"viewed-{i}", author=cls.author, content="w", excerpt="e", status="published",
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        view_counts.clear()
+        self.addCleanup(view_counts.clear)
+
+    def view_count(self, post):
+        post.refresh_from_db(fields=["view_count"])
+        return post.view_count
+
+    def test_detail_views_are_buffered_until_the_threshold(self):
+        post = self.posts[0]
+        for _ in range(2):
+            self.client.post("/blogs/post-detail/", {"id": post.pk})
+        self.assertEqual((self.view_count(post), view_counts.pending(post.pk)), (0, 2))
+        self.client.post("/blogs/post-detail/", {"id": post.pk})
+        self.assertEqual((self.view_count(post), view_counts.pending()), (3, 0))
+
+    def test_flush_adds_each_posts_increment(self):
+        view_counts.add(self.posts[0].pk)
+        view_counts.add(self.posts[1].pk)
+        view_counts.add(self.posts[2].pk, views=2)
+        self.assertEqual([self.view_count(post) for post in self.posts], [1, 1, 2])
+        self.assertEqual(view_counts.flush(), 0)
+
+
+class PostReadingStatsTest(TestCase):
+    def test_stats_are_stored_on_save_and_content_is_not_loaded(self):
+        author = CustomUser.objects.create(username="stats_author")
+        post = Post.objects.create(
+            title="Long", slug="long", author=author, content="word " * 450, excerpt="e", status="published",
+        )
+        post.refresh_from_db()
+        self.assertEqual((post.word_count, post.reading_time), (450, 2))
+        post.content = "word " * 50
+        post.save(update_fields=["content"])
+        post.refresh_from_db()
+        self.assertEqual((post.word_count, post.reading_time), (50, 1))
+
+        listed = PostSerializer.setup_eager_loading(Post.objects.all()).get()
+        self.assertIn("content", listed.get_deferred_fields())
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        with self.assertNumQueries(0):
+            self.assertEqual(fast_serializer(PostSerializer)(listed, context={"request": request})["reading_time"], "1 min")
+
+
+class CommentThreadsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create(username="commenter")
+        cls.post = Post.objects.create(
+            title="Threads", slug="threads", author=cls.user, content="w", excerpt="e", status="published",
+        )
+
+    def comment(self, content, parent=None, is_approved=True):
+        return Comment.objects.create(
+            post=self.post, user=self.user, parent=parent, content=content, is_approved=is_approved,
+        )
+
+    def get(self, **params):
+        with query_budget(budget_for("apps.blogs.views.post_comments_view")):
+            response = self.client.get(f"/blogs/posts/{self.post.pk}/comments/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    @staticmethod
+    def shape(threads):
+        return [(thread["content"], CommentThreadsTest.shape(thread["replies"])) for thread in threads]
+
+    def test_threads_nest_replies_and_skip_unapproved_subtrees(self):
+        first = self.comment("first")
+        reply = self.comment("reply", parent=first)
+        self.comment("nested", parent=reply)
+        hidden = self.comment("hidden", parent=first, is_approved=False)
+        self.comment("under hidden", parent=hidden)
+        second = self.comment("second")
+        self.comment("late reply", parent=first)
+        self.comment("other", parent=second)
+
+        self.assertEqual((reply.depth, reply.path), (1, f"{first.pk:010d}{reply.pk:010d}"))
+        self.assertEqual(self.shape(self.get()["results"]), [
+            ("first", [("reply", [("nested", [])]), ("late reply", [])]),
+            ("second", [("other", [])]),
+        ])
+        self.assertEqual(self.shape(self.get(replies=1)["results"]), [
+            ("first", [("reply", [])]),
+            ("second", [("other", [])]),
+        ])
+
+    def test_hidden_replies_do_not_count_toward_the_cap(self):
+        first = self.comment("first")
+        hidden = self.comment("hidden", parent=first, is_approved=False)
+        self.comment("under hidden", parent=self.comment("also under hidden", parent=hidden))
+        self.comment("visible", parent=first)
+        self.comment("visible too", parent=first)
+        hidden_root = self.comment("hidden root", is_approved=False)
+        self.comment("under hidden root", parent=hidden_root)
+        self.comment("second")
+
+        self.assertEqual(self.shape(self.get(replies=1)["results"]), [
+            ("first", [("visible", [])]),
+            ("second", []),
+        ])
+
+    def test_replying_to_bulk_created_comments_fills_their_paths_first(self):
+        root = Comment.objects.bulk_create([Comment(post=self.post, user=self.user, content="root", is_approved=True)])[0]
+        middle = Comment.objects.bulk_create([
+            Comment(post=self.post, user=self.user, parent=root, content="middle", is_approved=True),
+        ])[0]
+        reply = self.comment("reply", parent=middle)
+
+        self.assertEqual((reply.depth, reply.path), (2, f"{root.pk:010d}{middle.pk:010d}{reply.pk:010d}"))
+        self.assertEqual(
+            list(Comment.objects.order_by("path").values_list("content", "depth")),
+            [("root", 0), ("middle", 1), ("reply", 2)],
+        )
+        self.assertEqual(self.shape(self.get()["results"]), [("root", [("middle", [("reply", [])])])])
+
+    def test_replies_past_the_depth_limit_are_invalid(self):
+        parent = self.comment("root")
+        for depth in range(1, MAX_COMMENT_DEPTH):
+            parent = self.comment(f"depth {depth}", parent=parent)
+        too_deep = Comment(post=self.post, user=self.user, parent=parent, content="too deep")
+        with self.assertRaises(ValidationError) as raised:
+            too_deep.full_clean()
+        self.assertIn("parent", raised.exception.message_dict)
+
+    def test_top_level_threads_are_keyset_paginated(self):
+        roots = [self.comment(f"root {i}") for i in range(5)]
+        self.comment("reply", parent=roots[1])
+        page = self.get(page_size=2)
+        self.assertEqual(self.shape(page["results"]), [("root 0", []), ("root 1", [("reply", [])])])
+        self.assertIn(f"after={roots[1].pk}", page["next"])
+        last = self.get(page_size=2, after=roots[3].pk)
+        self.assertEqual((self.shape(last["results"]), last["next"]), ([("root 4", [])], None))
@@ -0,0 +1,93 @@
+"""Threaded comments of a post, read through materialized paths.
+
+A comment's ``path`` is its ancestors' ids and its own, each padded to
+``PATH_STEP`` digits, so ordering by path walks every thread depth-first
+and a comment's subtree is the contiguous path range from its own path
+to just before its next sibling's. A page of threads costs three
+queries: one index range scan over ``(post, depth, path)`` for the root
+paths, then two that scan each thread's range of ``(post, path)``, the
+first for its unapproved comments and the second for the rest, minus
+the unapproved comments' subtrees, with a window function capping each
+thread.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber, Substr
+
+from apps.blogs.models import PATH_STEP, Comment
+from apps.blogs.serializers import CommentSerializer
+from core.fast_serializers import fast_serializer
+
+
+def _padded(comment_id):
+    return f"{comment_id:0{PATH_STEP}d}"
+
+
+def _subtrees(paths, **lookups):
+    """Match the comments at ``paths`` and all of their replies.
+
+    ``lookups`` are repeated in every branch so SQLite can serve each
+    branch with its own index range scan.
+    """
+    return reduce(or_, (
+        Q(**lookups, path__gte=path, path__lt=path[:-PATH_STEP] + _padded(int(path[-PATH_STEP:]) + 1))
+        for path in paths
+    ))
+
+
+def build_tree(comments, rendered):
+    """Nest rendered comments (in path order) under their parents in one pass.
+
+    A reply whose parent is not in the list is left out with its subtree.
+    """
+    nodes = {}
+    roots = []
+    for comment, data in zip(comments, rendered):
+        data["replies"] = []
+        if comment.parent_id is None:
+            roots.append(data)
+        elif comment.parent_id in nodes:
+            nodes[comment.parent_id]["replies"].append(data)
+        else:
+            continue
+        nodes[comment.pk] = data
+    return roots
+
+
+def comment_threads(post, after=0, threads=20, replies=50):
+    """``(threads, next_after)`` for the approved threads of ``post`` whose root id is above ``after``.
+
+    Each thread keeps its first ``replies`` visible replies in depth-first
+    order, so every kept reply's parent is kept too. Replies under an
+    unapproved comment are hidden with it and don't count toward the cap.
+    """
+    roots = list(
+        Comment.objects.filter(post=post, is_approved=True, depth=0, path__gt=_padded(after))
+        .order_by("path").values_list("path", flat=True)[:threads + 1]
+    )
+    if not roots:
+        return [], None
+    has_next = len(roots) > threads
+    roots = roots[:threads]
+
+    hidden = []
+    unapproved = Comment.objects.filter(_subtrees(roots, post=post, is_approved=False))
+    for path in unapproved.order_by("path").values_list("path", flat=True):
+        # Sorted paths list an ancestor before its replies; its range already covers them.
+        if not hidden or not path.startswith(hidden[-1]):
+            hidden.append(path)
+    page = Comment.objects.filter(_subtrees(roots, post=post))
+    if hidden:
+        page = page.exclude(_subtrees(hidden))
+
+    comments = list(
+        page
+        .select_related("user")
+        .annotate(position=Window(RowNumber(), partition_by=Substr("path", 1, PATH_STEP), order_by=F("path").asc()))
+        .filter(position__lte=replies + 1)
+        .order_by("path")
+    )
+    tree = build_tree(comments, fast_serializer(CommentSerializer).many(comments))
+    return tree, int(roots[-1]) if has_next else None
@@ -1,6 +1,7 @@
 from django.urls import path
 
-from apps.blogs.views import user_register, category_view, post_detail_view
+from apps.blogs.views import user_register, category_view, post_detail_view, post_feed_view, \
+    post_comments_view
 
 app_name = 'blogs'
 
@@ -8,5 +9,7 @@ urlpatterns = [
     path('register/', user_register),
     path('category/', category_view),
     path('post-detail/', post_detail_view),
+    path('feed/', post_feed_view),
+    path('posts/<int:pk>/comments/', post_comments_view),
 
 ]
\ No newline at end of file
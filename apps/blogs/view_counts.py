@@ -0,0 +1,126 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import F
+
+from apps.blogs.models import Post
+
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCountBuffer:
+    """Per-process buffer of ``Post.view_count`` increments.
+
+    Views are added to an in-memory counter and written out when
+    ``BLOG_VIEW_COUNT_FLUSH_SIZE`` views are pending or the last flush is
+    ``BLOG_VIEW_COUNT_FLUSH_INTERVAL`` seconds old. A flush groups posts
+    by their increment and runs one
+    ``UPDATE ... SET view_count = view_count + n`` per group in a single
+    transaction, so a hot post costs one row update per flush rather than
+    one per read.
+
+    Once ``register()`` has run (``BlogsConfig.ready()`` does it), the
+    first pending view also starts a background timer, so an idle worker
+    still writes its views within one interval, and the buffer is flushed
+    at interpreter exit, which is how a worker's last views survive a
+    restart. Views buffered when a process is killed outright are lost.
+    The test runner calls ``unregister()``, since at exit it has already
+    pointed the connection back at the real database.
+    """
+
+    def __init__(self):
+        self._pending = Counter()
+        self._total = 0
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._registered = False
+        self._timer = None
+
+    @property
+    def flush_size(self):
+        return getattr(settings, "BLOG_VIEW_COUNT_FLUSH_SIZE", 500)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, "BLOG_VIEW_COUNT_FLUSH_INTERVAL", 30)
+
+    def add(self, post_id, views=1):
+        with self._lock:
+            self._pending[post_id] += views
+            self._total += views
+            due = self._total >= self.flush_size or time.monotonic() - self._flushed_at >= self.flush_interval
+            if not due and self._registered and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._timed_flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if due:
+            self.flush()
+
+    def _timed_flush(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            # The timer thread opened its own connection; don't leave it behind.
+            connection.close()
+
+    def pending(self, post_id=None):
+        with self._lock:
+            return self._total if post_id is None else self._pending.get(post_id, 0)
+
+    def _take(self):
+        with self._lock:
+            pending, self._pending, self._total = self._pending, Counter(), 0
+            self._flushed_at = time.monotonic()
+        return pending
+
+    def _restore(self, pending):
+        with self._lock:
+            self._pending.update(pending)
+            self._total += sum(pending.values())
+
+    def flush(self):
+        """Write pending increments and return how many views were written."""
+        pending = self._take()
+        if not pending:
+            return 0
+        by_views = defaultdict(list)
+        for post_id, views in pending.items():
+            by_views[views].append(post_id)
+        try:
+            with transaction.atomic():
+                # Sorted ids keep row locks in the same order across workers.
+                for views, post_ids in sorted(by_views.items()):
+                    Post.objects.filter(pk__in=sorted(post_ids)).update(view_count=F("view_count") + views)
+        except DatabaseError:
+            logger.exception("Could not flush %d buffered post views", sum(pending.values()))
+            self._restore(pending)
+            return 0
+        return sum(pending.values())
+
+    def clear(self):
+        self._take()
+
+    def register(self):
+        self._registered = True
+        atexit.register(self.flush)
+
+    def unregister(self):
+        """Stop timed and exit flushes and drop pending views."""
+        atexit.unregister(self.flush)
+        with self._lock:
+            self._registered = False
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self.clear()
+
+
+view_counts = ViewCountBuffer()
@@ -1,10 +1,16 @@
+from urllib.parse import urlencode
+
 from rest_framework import status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from apps.blogs.models import Post
-from apps.blogs.serializers import RegisterSerializer, CategorySerializer, PostSerializer
+from apps.blogs.pagination import PostFeedPagination
+from apps.blogs.serializers import RegisterSerializer, CategorySerializer, PostSerializer, CommentPageSerializer
+from apps.blogs.threads import comment_threads
+from apps.blogs.view_counts import view_counts
 from apps.hotel.models import CustomUser
+from core.fast_serializers import fast_serializer
 
 
 @api_view(['POST', 'GET'])
@@ -45,14 +51,41 @@ def post_detail_view(request):
     if not post_id:
         return Response({"error": "Post id is required"}, status=status.HTTP_400_BAD_REQUEST)
     try:
-        post = Post.objects.get(id=post_id)
+        post = PostSerializer.setup_eager_loading(Post.objects.all()).get(id=post_id)
         if post.status != 'published' and post.author != request.user:
             return Response({"error": "Post not found"}, status=status.HTTP_404_NOT_FOUND)
     except Post.DoesNotExist:
         return Response({"error": "Post not found"}, status=status.HTTP_404_NOT_FOUND)
 
-    serializer = PostSerializer(post, context={'request': request})
-    data = serializer.data
+    data = fast_serializer(PostSerializer)(post, context={'request': request})
     if data is None:
         return Response({"error": "Post not found"}, status=status.HTTP_404_NOT_FOUND)
-    return Response(data)
\ No newline at end of file
+    view_counts.add(post.pk)
+    return Response(data)
+
+@api_view(["GET"])
+def post_feed_view(request):
+    # The cursor filters on published_date, which never matches NULL.
+    posts = PostSerializer.setup_eager_loading(Post.objects.filter(status='published', published_date__isnull=False))
+    paginator = PostFeedPagination()
+    page = paginator.paginate_queryset(posts, request)
+    context = {'request': request, **PostSerializer.user_flags_context(request.user, page)}
+    return paginator.get_paginated_response(fast_serializer(PostSerializer).many(page, context=context))
+
+
+@api_view(["GET"])
+def post_comments_view(request, pk):
+    params = CommentPageSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    post = Post.objects.filter(pk=pk).only('status', 'author_id').first()
+    if post is None or (post.status != 'published' and post.author_id != request.user.pk):
+        return Response({"error": "Post not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    data = params.validated_data
+    threads, next_after = comment_threads(post, data['after'], data['page_size'], data['replies'])
+    next_url = None
+    if next_after is not None:
+        query = {**data, 'after': next_after}
+        next_url = request.build_absolute_uri(f"{request.path}?{urlencode(query)}")
+    return Response({"next": next_url, "results": threads})
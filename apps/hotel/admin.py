@@ -1,7 +1,20 @@
 from django.contrib import admin
-from .models import CustomUser, Hotel, RoomType, Amenity, Room, Booking, RoomReview
+from django.db.models import Q
+from .models import CustomUser, Hotel, RoomType, Amenity, Room, RoomRateOverride, Booking, RoomReview
 from django.contrib.auth.admin import UserAdmin
 
+from core.large_tables import EstimatedCountPaginator, IndexSeekQuerySet
+
+
+# 🔹 Katta jadvallar uchun: exact COUNT(*) o'rniga taxminiy son, qidiruv faqat indeksli ustunlar bo'yicha
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return IndexSeekQuerySet(model=queryset.model, query=queryset.query, using=queryset.db)
+
 # 🔹 CustomUser uchun admin
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
@@ -42,22 +55,46 @@ class AmenityAdmin(admin.ModelAdmin):
 
 # 🔹 Room
 @admin.register(Room)
-class RoomAdmin(admin.ModelAdmin):
+class RoomAdmin(LargeTableAdmin):
     list_display = ("room_number", "hotel", "room_type", "capacity", "floor", "status", "price_per_night", "discount_percentage")
-    list_filter = ("status", "hotel", "room_type", "floor")
-    search_fields = ("room_number", "hotel__name", "room_type__name")
-    filter_horizontal = ("amenities",)
+    list_select_related = ("hotel", "room_type")
+    list_filter = ("status", "room_type")
+    search_fields = ("room_number__exact", "hotel__name__exact")
+    autocomplete_fields = ("hotel", "room_type", "amenities")
+
+    def get_search_results(self, request, queryset, search_term):
+        # hotel__name JOIN bilan OR qilinsa butun jadval skan bo'ladi, subquery bilan ikkala shart ham indeksdan o'qiladi
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        hotels = Hotel.objects.filter(name=term).values("id")
+        return queryset.filter(Q(room_number=term) | Q(hotel__in=hotels)), False
+
+# 🔹 RoomRateOverride
+@admin.register(RoomRateOverride)
+class RoomRateOverrideAdmin(LargeTableAdmin):
+    list_display = ("room", "date", "price_per_night")
+    list_select_related = ("room__hotel",)
+    list_filter = ("date",)
+    search_fields = ("room__room_number__exact",)
+    raw_id_fields = ("room",)
 
 # 🔹 Booking
 @admin.register(Booking)
-class BookingAdmin(admin.ModelAdmin):
+class BookingAdmin(LargeTableAdmin):
     list_display = ("room", "user", "check_in", "check_out", "guests_count", "total_price", "status")
-    list_filter = ("status", "check_in", "check_out")
-    search_fields = ("room__room_number", "user__username")
+    list_select_related = ("room__hotel", "user")
+    list_filter = ("status",)
+    date_hierarchy = "check_in"
+    ordering = ("-check_in",)
+    search_fields = ("user__username__exact",)
+    raw_id_fields = ("room", "user")
 
 # 🔹 RoomReview
 @admin.register(RoomReview)
-class RoomReviewAdmin(admin.ModelAdmin):
+class RoomReviewAdmin(LargeTableAdmin):
     list_display = ("room", "user", "overall_rating", "cleanliness_rating", "comfort_rating", "service_rating", "created_at")
-    list_filter = ("overall_rating", "created_at")
-    search_fields = ("room__room_number", "user__username", "comment")
+    list_select_related = ("room__hotel", "user")
+    list_filter = ("created_at",)
+    search_fields = ("user__username__exact",)
+    raw_id_fields = ("room", "user")
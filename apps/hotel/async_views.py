@@ -0,0 +1,121 @@
+"""Async-native versions of the hot hotel read endpoints.
+
+DRF's ``@api_view`` is sync only, so under ASGI every request to the views
+in ``views.py`` hops to the sync thread. These views stay on the event
+loop, use the async ORM and start their independent queries together with
+``asyncio.gather``. The payloads match their sync counterparts; rendering
+reuses the compiled serializers on the already loaded objects.
+"""
+import asyncio
+
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags, urlencode
+from django.views.decorators.http import require_GET
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.hotel.cache import aget_room_detail, aset_room_detail
+from apps.hotel.models import Amenity, Room, RoomReview
+from apps.hotel.pagination import RoomCursorPagination
+from apps.hotel.serializer import RoomDetailSerializer, RoomSerializer
+from core.fast_serializers import fast_serializer
+
+
+def _json(data, status=200, headers=None):
+    return JsonResponse(
+        data, status=status, headers=headers, safe=False, encoder=JSONEncoder,
+        json_dumps_params={"ensure_ascii": False},
+    )
+
+
+def _prefetched(instance, name, objects):
+    """Attach ``objects`` as if ``prefetch_related(name)`` had loaded them."""
+    queryset = getattr(instance, name).all()
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+    if not hasattr(instance, "_prefetched_objects_cache"):
+        instance._prefetched_objects_cache = {}
+    instance._prefetched_objects_cache[name] = queryset
+
+
+async def _alist(queryset):
+    return [obj async for obj in queryset]
+
+
+def _room_query():
+    return Room.objects.select_related("hotel", "room_type")
+
+
+@require_GET
+async def room_detail_async_view(request, pk):
+    cached = await aget_room_detail(pk)
+    if cached is None:
+        try:
+            room, amenities, reviews, rooms_count = await asyncio.gather(
+                _room_query().aget(pk=pk),
+                _alist(Amenity.objects.filter(rooms__id=pk)),
+                _alist(RoomReview.objects.filter(room_id=pk).select_related("user").order_by("pk")),
+                Room.objects.filter(hotel__rooms__id=pk).acount(),
+            )
+        except Room.DoesNotExist:
+            return _json({"error": "Room not found"}, status=404)
+        _prefetched(room, "amenities", amenities)
+        _prefetched(room, "reviews", reviews)
+        room.hotel.rooms_count = rooms_count
+        cached = await aset_room_detail(pk, fast_serializer(RoomDetailSerializer)(room))
+
+    etag, data = cached
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+    return _json(data, headers={"ETag": etag})
+
+
+@require_GET
+async def room_async_view(request, pk):
+    try:
+        room, amenities = await asyncio.gather(
+            _room_query().aget(pk=pk),
+            _alist(Amenity.objects.filter(rooms__id=pk)),
+        )
+    except Room.DoesNotExist:
+        return _json({"error": "Room not found"}, status=404)
+    _prefetched(room, "amenities", amenities)
+    return _json(fast_serializer(RoomSerializer)(room))
+
+
+@require_GET
+async def rooms_async_view(request):
+    """Keyset-paginated room list: ``?after=<last id>&page_size=<n>``.
+
+    The page and the amenity rows of the same page (selected through a
+    subquery on the page ids) are fetched together.
+    """
+    try:
+        after = int(request.GET.get("after", 0))
+        page_size = int(request.GET.get("page_size", RoomCursorPagination.page_size))
+    except ValueError:
+        return _json({"error": "after and page_size must be integers"}, status=400)
+    page_size = max(1, min(page_size, RoomCursorPagination.max_page_size))
+
+    page = _room_query().filter(id__gt=after).order_by("id")
+    through = Room.amenities.through
+    rooms, links = await asyncio.gather(
+        _alist(page[:page_size + 1]),
+        _alist(through.objects.filter(room_id__in=page.values("id")[:page_size]).select_related("amenity")),
+    )
+    has_next = len(rooms) > page_size
+    rooms = rooms[:page_size]
+
+    amenities = {}
+    for link in links:
+        amenities.setdefault(link.room_id, []).append(link.amenity)
+    for room in rooms:
+        _prefetched(room, "amenities", amenities.get(room.pk, ()))
+
+    next_url = None
+    if has_next:
+        next_url = request.build_absolute_uri(
+            f"{request.path}?{urlencode({'after': rooms[-1].pk, 'page_size': page_size})}"
+        )
+    return _json({"next": next_url, "results": fast_serializer(RoomSerializer).many(rooms)})
@@ -0,0 +1,186 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+
+from apps.hotel.models import Booking
+
+
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+
+class RoomIntervals:
+    """Active bookings of one room, sorted by check-in.
+
+    ``max_ends[i]`` is the latest check-out among the first ``i + 1``
+    intervals, so an overlap test is a single bisect plus one comparison
+    even when legacy data contains overlapping bookings.
+    """
+
+    __slots__ = ("intervals", "starts", "max_ends", "loaded_at")
+
+    def __init__(self, intervals=()):
+        self.intervals = sorted(intervals)
+        self.loaded_at = time.monotonic()
+        self._reindex()
+
+    def _reindex(self):
+        self.starts = [item[0] for item in self.intervals]
+        self.max_ends = []
+        latest = None
+        for _, check_out, _ in self.intervals:
+            latest = check_out if latest is None or check_out > latest else latest
+            self.max_ends.append(latest)
+
+    def add(self, check_in, check_out, booking_id):
+        insort(self.intervals, (check_in, check_out, booking_id))
+        self._reindex()
+
+    def discard(self, booking_id):
+        kept = [item for item in self.intervals if item[2] != booking_id]
+        if len(kept) != len(self.intervals):
+            self.intervals = kept
+            self._reindex()
+
+    def overlaps(self, check_in, check_out, exclude=None):
+        i = bisect_left(self.starts, check_out)
+        if i == 0 or self.max_ends[i - 1] <= check_in:
+            return False
+        if exclude is None:
+            return True
+        return any(
+            booking_id != exclude and end > check_in
+            for _, end, booking_id in self.intervals[:i]
+        )
+
+
+class AvailabilityIndex:
+    """Per-process index of pending/confirmed bookings keyed by room id.
+
+    Rooms are loaded lazily with one query the first time they are checked
+    (or once their entry is older than ``HOTEL_AVAILABILITY_INDEX_TTL``
+    seconds) and kept current by the ``Booking`` signal handlers below.
+    Writes made by other processes or through ``QuerySet.update()`` and
+    ``bulk_create()`` do not fire signals here, so a cached entry is only a
+    hint: "free" is trusted, since ``reserve_room`` repeats the overlap
+    check under the room lock, and "busy" is confirmed by reloading the
+    room before it is reported. At most ``HOTEL_AVAILABILITY_INDEX_SIZE``
+    rooms are kept, least recently checked first out.
+    """
+
+    def __init__(self):
+        self._rooms = OrderedDict()
+        self._booking_rooms = {}
+        self._lock = threading.RLock()
+
+    @property
+    def ttl(self):
+        return getattr(settings, "HOTEL_AVAILABILITY_INDEX_TTL", 60)
+
+    @property
+    def max_rooms(self):
+        return getattr(settings, "HOTEL_AVAILABILITY_INDEX_SIZE", 10000)
+
+    def _is_warm(self, entry):
+        return entry is not None and time.monotonic() - entry.loaded_at < self.ttl
+
+    def _drop(self, room_id):
+        entry = self._rooms.pop(room_id, None)
+        if entry is not None:
+            for _, _, booking_id in entry.intervals:
+                self._booking_rooms.pop(booking_id, None)
+
+    def _store(self, room_id, entry):
+        self._drop(room_id)
+        self._rooms[room_id] = entry
+        for _, _, booking_id in entry.intervals:
+            self._booking_rooms[booking_id] = room_id
+        while len(self._rooms) > self.max_rooms:
+            self._drop(next(iter(self._rooms)))
+
+    def load_room(self, room_id):
+        rows = Booking.objects.filter(
+            room_id=room_id, status__in=ACTIVE_STATUSES
+        ).values_list("check_in", "check_out", "id")
+        entry = RoomIntervals(rows)
+        with self._lock:
+            self._store(room_id, entry)
+        return entry
+
+    def load_rooms(self, room_ids):
+        grouped = {room_id: [] for room_id in room_ids}
+        rows = Booking.objects.filter(
+            room_id__in=grouped, status__in=ACTIVE_STATUSES
+        ).values_list("room_id", "check_in", "check_out", "id")
+        for room_id, check_in, check_out, booking_id in rows:
+            grouped[room_id].append((check_in, check_out, booking_id))
+        with self._lock:
+            for room_id, intervals in grouped.items():
+                self._store(room_id, RoomIntervals(intervals))
+
+    def is_available(self, room_id, check_in, check_out, exclude=None):
+        with self._lock:
+            entry = self._rooms.get(room_id)
+            if self._is_warm(entry):
+                self._rooms.move_to_end(room_id)
+                if not entry.overlaps(check_in, check_out, exclude):
+                    return True
+        # Cold, or a cached "busy" that may be stale: ask the database.
+        entry = self.load_room(room_id)
+        with self._lock:
+            return not entry.overlaps(check_in, check_out, exclude)
+
+    def _forget(self, booking_id):
+        previous_room_id = self._booking_rooms.pop(booking_id, None)
+        entry = self._rooms.get(previous_room_id)
+        if entry is not None:
+            entry.discard(booking_id)
+
+    def booking_saved(self, booking_id, room_id, check_in, check_out, status):
+        with self._lock:
+            self._forget(booking_id)
+            entry = self._rooms.get(room_id)
+            if entry is not None and status in ACTIVE_STATUSES:
+                entry.add(check_in, check_out, booking_id)
+                self._booking_rooms[booking_id] = room_id
+
+    def booking_deleted(self, booking_id):
+        with self._lock:
+            self._forget(booking_id)
+
+    def invalidate(self, room_id=None):
+        with self._lock:
+            if room_id is None:
+                self._rooms.clear()
+                self._booking_rooms.clear()
+                return
+            self._drop(room_id)
+
+
+availability_index = AvailabilityIndex()
+
+
+def is_room_available(room, check_in, check_out, exclude=None):
+    room_id = getattr(room, "pk", room)
+    return availability_index.is_available(room_id, check_in, check_out, exclude)
+
+
+def overlapping_bookings(check_in, check_out):
+    return Booking.objects.filter(
+        status__in=ACTIVE_STATUSES,
+        check_in__lt=check_out,
+        check_out__gt=check_in,
+    )
+
+
+def available_rooms(queryset, check_in, check_out):
+    """Narrow ``queryset`` to rooms with no active booking in the range.
+
+    The check is a correlated ``NOT EXISTS`` so the whole search stays one
+    query regardless of how many rooms match.
+    """
+    busy = overlapping_bookings(check_in, check_out).filter(room=OuterRef("pk"))
+    return queryset.exclude(Exists(busy))
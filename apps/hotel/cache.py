@@ -0,0 +1,64 @@
+import hashlib
+import json
+
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.hotel.models import Room
+from core.caching import clear_cache
+
+
+ROOM_DETAIL_CACHE = "room_detail"
+
+
+def _key(room_id):
+    return f"room-detail:{room_id}"
+
+
+def room_detail_etag(data):
+    payload = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode()
+    return '"%s"' % hashlib.md5(payload, usedforsecurity=False).hexdigest()
+
+
+def get_room_detail(room_id):
+    """Return the cached ``(etag, data)`` pair for a room, or ``None``."""
+    return caches[ROOM_DETAIL_CACHE].get(_key(room_id))
+
+
+def set_room_detail(room_id, data):
+    entry = (room_detail_etag(data), data)
+    caches[ROOM_DETAIL_CACHE].set(_key(room_id), entry)
+    return entry
+
+
+async def aget_room_detail(room_id):
+    return await caches[ROOM_DETAIL_CACHE].aget(_key(room_id))
+
+
+async def aset_room_detail(room_id, data):
+    entry = (room_detail_etag(data), data)
+    await caches[ROOM_DETAIL_CACHE].aset(_key(room_id), entry)
+    return entry
+
+
+def invalidate_room_details(room_ids):
+    """Drop cached payloads now and again once the surrounding transaction
+    commits, so a reader that re-cached pre-commit data cannot keep it."""
+    keys = [_key(room_id) for room_id in set(room_ids)]
+    if not keys:
+        return
+    cache = caches[ROOM_DETAIL_CACHE]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_hotel_room_details(hotel_ids):
+    """Invalidate every room of these hotels, e.g. after their ``rooms_count`` changed."""
+    hotel_ids = {hotel_id for hotel_id in hotel_ids if hotel_id is not None}
+    if hotel_ids:
+        invalidate_room_details(Room.objects.filter(hotel_id__in=hotel_ids).values_list("id", flat=True))
+
+
+def clear_room_details():
+    clear_cache(ROOM_DETAIL_CACHE)
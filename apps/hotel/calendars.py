@@ -0,0 +1,137 @@
+"""Free/busy calendars of rooms, one bitset per (room, month).
+
+Bit ``n`` of a month's mask is set when night ``n + 1`` of that month is
+taken by a pending or confirmed booking. Masks live in the
+``availability_calendar`` cache under a per-room generation token; a
+booking change drops the room's token, so the next read starts a new one
+and every cached month of the room is retired at once, without knowing
+the booking's old dates. Misses for a whole hotel are filled from a
+single ``Booking`` query. Without a shared cache backend (see
+``REDIS_URL`` in settings) each worker keeps its own masks, and a write
+in one worker reaches the others only when their entries expire.
+"""
+import re
+import uuid
+from calendar import monthrange
+from datetime import date
+
+from django.core.cache import caches
+from django.db import transaction
+
+from apps.hotel.availability import ACTIVE_STATUSES
+from apps.hotel.models import Booking
+from core.caching import clear_cache
+
+
+CALENDAR_CACHE = "availability_calendar"
+BUSY_RUN = re.compile("1+")
+
+
+def month_starts(first, months):
+    year, month = first.year, first.month
+    for _ in range(months):
+        yield date(year, month, 1)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _add_month(day):
+    return date(day.year + 1, 1, 1) if day.month == 12 else date(day.year, day.month + 1, 1)
+
+
+def _generation_key(room_id):
+    return f"calendar-generation:{room_id}"
+
+
+def _month_key(room_id, generation, month):
+    return f"calendar:{room_id}:{generation}:{month:%Y-%m}"
+
+
+def _generations(cache, room_ids):
+    keys = {room_id: _generation_key(room_id) for room_id in room_ids}
+    found = cache.get_many(keys.values())
+    generations = {room_id: found.get(key) for room_id, key in keys.items()}
+    fresh = {room_id: uuid.uuid4().hex for room_id, generation in generations.items() if generation is None}
+    if fresh:
+        cache.set_many({keys[room_id]: generation for room_id, generation in fresh.items()})
+        generations.update(fresh)
+    return generations
+
+
+def busy_masks(room_ids, first, months):
+    """``{room_id: [mask, ...]}`` for ``months`` months from ``first``."""
+    room_ids = list(room_ids)
+    months = list(month_starts(first, months))
+    cache = caches[CALENDAR_CACHE]
+    generations = _generations(cache, room_ids)
+    keys = {
+        (room_id, month): _month_key(room_id, generations[room_id], month)
+        for room_id in room_ids
+        for month in months
+    }
+    cached = cache.get_many(keys.values())
+    masks = {room_id: [cached.get(keys[room_id, month]) for month in months] for room_id in room_ids}
+
+    missing = [room_id for room_id, room_masks in masks.items() if None in room_masks]
+    if missing:
+        computed = _compute(missing, months)
+        masks.update(computed)
+        cache.set_many({
+            keys[room_id, month]: mask
+            for room_id in missing
+            for month, mask in zip(months, computed[room_id])
+        })
+    return masks
+
+
+def _compute(room_ids, months):
+    start, end = months[0], _add_month(months[-1])
+    origin = start.toordinal()
+    nights = {room_id: 0 for room_id in room_ids}
+    rows = Booking.objects.filter(
+        room_id__in=room_ids, status__in=ACTIVE_STATUSES, check_in__lt=end, check_out__gt=start,
+    ).values_list("room_id", "check_in", "check_out")
+    for room_id, check_in, check_out in rows:
+        first = max(check_in.toordinal(), origin) - origin
+        last = min(check_out.toordinal(), end.toordinal()) - origin
+        nights[room_id] |= ((1 << (last - first)) - 1) << first
+
+    computed = {}
+    for room_id, mask in nights.items():
+        room_masks = []
+        for month in months:
+            days = monthrange(month.year, month.month)[1]
+            room_masks.append((mask >> (month.toordinal() - origin)) & ((1 << days) - 1))
+        computed[room_id] = room_masks
+    return computed
+
+
+def busy_runs(mask):
+    """Run-length encode a month mask as ``[[first_day, nights], ...]``."""
+    bits = format(mask, "b")[::-1]
+    return [[run.start() + 1, run.end() - run.start()] for run in BUSY_RUN.finditer(bits)]
+
+
+def room_calendars(room_ids, first, months):
+    masks = busy_masks(room_ids, first, months)
+    labels = [f"{month:%Y-%m}" for month in month_starts(first, months)]
+    return [
+        {
+            "room": room_id,
+            "months": [{"month": label, "busy": busy_runs(mask)} for label, mask in zip(labels, masks[room_id])],
+        }
+        for room_id in room_ids
+    ]
+
+
+def invalidate_room_calendars(room_ids):
+    """Retire every cached month of these rooms, now and again on commit."""
+    cache = caches[CALENDAR_CACHE]
+    keys = [_generation_key(room_id) for room_id in set(room_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def clear_room_calendars():
+    clear_cache(CALENDAR_CACHE)
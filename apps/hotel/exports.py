@@ -0,0 +1,110 @@
+import csv
+from decimal import Decimal
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from apps.hotel.models import Booking, RoomReview
+
+
+CHUNK_SIZE = 2000
+
+BOOKING_COLUMNS = (
+    ("id", "id"),
+    ("room", "room_id"),
+    ("room_number", "room__room_number"),
+    ("hotel", "room__hotel_id"),
+    ("hotel_name", "room__hotel__name"),
+    ("user", "user_id"),
+    ("username", "user__username"),
+    ("check_in", "check_in"),
+    ("check_out", "check_out"),
+    ("guests_count", "guests_count"),
+    ("total_price", "total_price"),
+    ("status", "status"),
+    ("created_at", "created_at"),
+)
+
+REVIEW_COLUMNS = (
+    ("id", "id"),
+    ("room", "room_id"),
+    ("room_number", "room__room_number"),
+    ("hotel", "room__hotel_id"),
+    ("hotel_name", "room__hotel__name"),
+    ("user", "user_id"),
+    ("username", "user__username"),
+    ("cleanliness_rating", "cleanliness_rating"),
+    ("comfort_rating", "comfort_rating"),
+    ("service_rating", "service_rating"),
+    ("overall_rating", "overall_rating"),
+    ("comment", "comment"),
+    ("created_at", "created_at"),
+)
+
+
+class _ExportEncoder(JSONEncoder):
+    def default(self, obj):
+        # Keep money exact instead of DRF's float coercion.
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(header, rows):
+    encoder = _ExportEncoder()
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + "\n"
+
+
+def stream_rows(queryset, columns, output, filename):
+    """Stream ``queryset`` as CSV or NDJSON without materializing it.
+
+    Related columns are fetched through joins in the same query and rows
+    are pulled with ``iterator(chunk_size=...)``, so memory stays flat no
+    matter how many rows are exported.
+    """
+    header = [name for name, _ in columns]
+    rows = queryset.values_list(*(lookup for _, lookup in columns)).order_by("id").iterator(chunk_size=CHUNK_SIZE)
+    if output == "csv":
+        response = StreamingHttpResponse(_csv_lines(header, rows), content_type="text/csv")
+        response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    else:
+        response = StreamingHttpResponse(_ndjson_lines(header, rows), content_type="application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="{filename}.ndjson"'
+    return response
+
+
+def bookings_export(filters):
+    bookings = Booking.objects.all()
+    if filters.get("hotel"):
+        bookings = bookings.filter(room__hotel_id=filters["hotel"])
+    if filters.get("status"):
+        bookings = bookings.filter(status=filters["status"])
+    if filters.get("start"):
+        bookings = bookings.filter(check_in__gte=filters["start"])
+    if filters.get("end"):
+        bookings = bookings.filter(check_in__lt=filters["end"])
+    return stream_rows(bookings, BOOKING_COLUMNS, filters["output"], "bookings")
+
+
+def reviews_export(filters):
+    reviews = RoomReview.objects.all()
+    if filters.get("hotel"):
+        reviews = reviews.filter(room__hotel_id=filters["hotel"])
+    if filters.get("start"):
+        reviews = reviews.filter(created_at__date__gte=filters["start"])
+    if filters.get("end"):
+        reviews = reviews.filter(created_at__date__lt=filters["end"])
+    return stream_rows(reviews, REVIEW_COLUMNS, filters["output"], "reviews")
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.hotel.cache import clear_room_details
+from apps.hotel.models import Room
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync hotel read views with their async versions under concurrent load. "
+        "Requests go through the project's ASGI application in-process, or to a running ASGI "
+        "server (e.g. `uvicorn core.asgi:application --workers 1`) with --base-url, one connection "
+        "per request. Run `manage.py seed` first so there is data to read."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--concurrency", type=int, default=100)
+        parser.add_argument("--room", type=int, help="Room id to read; defaults to the first room")
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument("--cold", action="store_true", help="Clear the room detail cache before each request (in-process only)")
+        parser.add_argument("--base-url", help="Benchmark a running server instead, e.g. http://127.0.0.1:8000")
+        parser.add_argument("--output", help="Write results as JSON to this path")
+
+    def handle(self, *args, **options):
+        room_id = options["room"] or Room.objects.order_by("id").values_list("id", flat=True).first()
+        if room_id is None:
+            raise CommandError("No rooms to read; run manage.py seed first")
+        if options["cold"] and options["base_url"]:
+            raise CommandError("--cold only works in-process")
+
+        if options["base_url"]:
+            self.fetch = self._http_get
+            self.base = urlsplit(options["base_url"])
+        else:
+            from core.asgi import application
+
+            self.application = application
+            self.fetch = self._asgi_get
+        self.cold = options["cold"]
+
+        page = f"page_size={options['page_size']}"
+        pairs = [
+            ("room detail", f"/hotel/rooms-detail/{room_id}/", f"/hotel/async/rooms-detail/{room_id}/"),
+            ("room", f"/hotel/rooms/{room_id}/", f"/hotel/async/rooms/{room_id}/"),
+            ("rooms list", f"/hotel/rooms/?{page}", f"/hotel/async/rooms/?{page}"),
+        ]
+        results = []
+        for name, sync_path, async_path in pairs:
+            for flavour, path in (("sync", sync_path), ("async", async_path)):
+                result = asyncio.run(self._load(path, options["requests"], options["concurrency"]))
+                result.update(name=name, view=flavour, path=path)
+                results.append(result)
+                self.stdout.write(
+                    f"{name:<12} {flavour:<6} {result['rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f}ms  "
+                    f"p95 {result['p95_ms']:8.2f}ms  errors {result['errors']}"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump({
+                    "target": options["base_url"] or "in-process",
+                    "requests": options["requests"],
+                    "concurrency": options["concurrency"],
+                    "cold": self.cold,
+                    "results": results,
+                }, handle, indent=2)
+
+    async def _load(self, path, requests, concurrency):
+        latencies, errors = [], 0
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one():
+            nonlocal errors
+            async with gate:
+                if self.cold:
+                    clear_room_details()
+                started = time.perf_counter()
+                status = await self.fetch(path)
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors += status != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+        latencies.sort()
+        return {
+            "rps": round(requests / elapsed, 1),
+            "p50_ms": round(statistics.median(latencies), 3),
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 3),
+            "errors": errors,
+        }
+
+    async def _asgi_get(self, path):
+        path, _, query = path.partition("?")
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+            "root_path": "", "headers": [(b"host", b"localhost")], "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        received = False
+        status = None
+
+        async def receive():
+            nonlocal received
+            if received:
+                # The handler keeps listening for a disconnect that never comes.
+                await asyncio.Future()
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        await self.application(scope, receive, send)
+        return status
+
+    async def _http_get(self, path):
+        reader, writer = await asyncio.open_connection(self.base.hostname, self.base.port or 80)
+        try:
+            writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {self.base.netloc}\r\nConnection: close\r\n\r\n".encode()
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            await reader.read()
+            return int(status_line.split()[1])
+        finally:
+            writer.close()
@@ -0,0 +1,69 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.hotel.models import Amenity, Hotel, Room, RoomType
+from apps.hotel.serializer import RoomDetailSerializer, RoomSerializer
+from core.fast_serializers import fast_serializer
+
+
+class Command(BaseCommand):
+    help = "Compare DRF and compiled serializer rendering time on a temporary set of rooms (rolled back)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rooms = self._seed(options["rooms"])
+            for serializer_class in (RoomSerializer, RoomDetailSerializer):
+                drf = self._best(lambda: serializer_class(rooms, many=True).data, options["repeat"])
+                fast = self._best(lambda: fast_serializer(serializer_class).many(rooms), options["repeat"])
+                self.stdout.write(
+                    f"{serializer_class.__name__:<22} rooms={len(rooms)} "
+                    f"drf={drf * 1000:.1f}ms fast={fast * 1000:.1f}ms speedup={drf / fast:.1f}x"
+                )
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _best(render, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    @staticmethod
+    def _seed(count):
+        hotel = Hotel.objects.create(
+            name="Benchmark Hotel", description="d", address="a", city="Tashkent", country="Uzbekistan",
+            star_rating=4, phone="+998901234567", email="benchmark@example.com",
+        )
+        room_type = RoomType.objects.create(name="Benchmark", description="d")
+        amenities = Amenity.objects.bulk_create([Amenity(name=f"amenity {i}", icon="i") for i in range(5)])
+        rooms = Room.objects.bulk_create(
+            Room(
+                hotel=hotel, room_number=str(i), room_type=room_type, price_per_night=Decimal("99.90"),
+                discount_percentage=i % 3 * 10, capacity=2, floor=i // 50, description="d",
+                reviews_count=i % 7, overall_rating_sum=i % 7 * 4, cleanliness_rating_sum=i % 7 * 5,
+                comfort_rating_sum=i % 7 * 3, service_rating_sum=i % 7 * 4,
+            )
+            for i in range(count)
+        )
+        through = Room.amenities.through
+        through.objects.bulk_create(
+            through(room_id=room.pk, amenity_id=amenity.pk) for room in rooms for amenity in amenities[: room.pk % 5]
+        )
+        rooms = list(
+            Room.objects.filter(hotel=hotel).select_related("hotel", "room_type")
+            .prefetch_related("amenities", "reviews")
+        )
+        # Keep HotelSerializer.rooms_count from issuing a COUNT per room so the
+        # timings measure rendering only.
+        for room in rooms:
+            room.hotel.rooms_count = count
+        return rooms
@@ -0,0 +1,144 @@
+import json
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.hotel.availability import ACTIVE_STATUSES, available_rooms
+from apps.hotel.models import Booking, CustomUser, Hotel, Room, RoomReview, RoomType
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed large hotel tables inside a rolled-back transaction, then record the query plan and "
+        "timings of each hot query. With --check, exit non-zero when a plan stops using its index."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hotels", type=int, default=200)
+        parser.add_argument("--rooms-per-hotel", type=int, default=50)
+        parser.add_argument("--bookings-per-room", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--output", help="Write results as JSON to this path")
+        parser.add_argument("--check", action="store_true", help="Fail if any hot query stops using its index")
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                self._seed(options)
+                results = [
+                    self._measure(name, queryset, indexes, options["repeat"])
+                    for name, queryset, indexes in self._hot_queries()
+                ]
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        for result in results:
+            flag = f"  MISSING {' / '.join(result['expected_indexes'])}" if result["regressed"] else ""
+            self.stdout.write(f"{result['name']:<24} {result['mean_ms']:8.3f}ms{flag}")
+            for line in result["plan"].splitlines():
+                self.stdout.write(f"    {line}")
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump({"vendor": connection.vendor, "options": self._sizes(options), "queries": results}, handle, indent=2)
+        if options["check"] and any(result["regressed"] for result in results):
+            raise CommandError("A hot query no longer uses its index")
+
+    @staticmethod
+    def _sizes(options):
+        return {key: options[key] for key in ("hotels", "rooms_per_hotel", "bookings_per_room", "repeat", "seed")}
+
+    def _seed(self, options):
+        user = CustomUser.objects.create(username="benchmark_queries", phone_number="+998901234567")
+        room_type = RoomType.objects.create(name="Benchmark", description="d")
+        hotels = Hotel.objects.bulk_create(
+            Hotel(
+                name=f"Hotel {i}", description="d", address="a", city=f"City {i % 20}", country="Uzbekistan",
+                star_rating=1 + i % 5, phone="+998901234567", email=f"benchmark-{i}@example.com",
+            )
+            for i in range(options["hotels"])
+        )
+        rooms = Room.objects.bulk_create(
+            (
+                Room(
+                    hotel=hotel, room_number=str(n), room_type=room_type, price_per_night=Decimal("100.00"),
+                    capacity=2, floor=1, description="d", status=self.random.choice(("available", "occupied")),
+                )
+                for hotel in hotels
+                for n in range(options["rooms_per_hotel"])
+            ),
+            batch_size=2000,
+        )
+        start = date(2030, 1, 1)
+        bookings = []
+        for room in rooms:
+            day = start
+            for _ in range(options["bookings_per_room"]):
+                nights = self.random.randint(1, 5)
+                bookings.append(Booking(
+                    room=room, user=user, check_in=day, check_out=day + timedelta(days=nights), guests_count=1,
+                    total_price=Decimal("100.00") * nights, status=self.random.choice(Booking.STATUS_CHOICES)[0],
+                ))
+                day += timedelta(days=nights + self.random.randint(0, 3))
+            if len(bookings) >= 5000:
+                Booking.objects.bulk_create(bookings)
+                bookings = []
+        Booking.objects.bulk_create(bookings)
+        RoomReview.objects.bulk_create(
+            (
+                RoomReview(
+                    room=room, user=user, cleanliness_rating=4, comfort_rating=4, service_rating=4,
+                    overall_rating=4, comment="Benchmark review",
+                )
+                for room in rooms
+            ),
+            batch_size=2000,
+        )
+        self.sample = {"room": rooms[len(rooms) // 2], "hotel": hotels[len(hotels) // 2], "user": user}
+
+    def _hot_queries(self):
+        """``(name, queryset, index names the plan may use)`` for each hot query.
+
+        Unique constraints get backend-generated index names, hence the
+        alternatives.
+        """
+        room, hotel, user = self.sample["room"], self.sample["hotel"], self.sample["user"]
+        check_in, check_out = date(2030, 2, 1), date(2030, 2, 4)
+        return [
+            ("booking_overlap", Booking.objects.filter(
+                room=room, status__in=ACTIVE_STATUSES, check_in__lt=check_out, check_out__gt=check_in,
+            ), ("booking_overlap_idx",)),
+            ("rooms_by_hotel_status", Room.objects.filter(hotel=hotel, status="available"), ("room_hotel_status_idx",)),
+            ("review_already_left", RoomReview.objects.filter(user=user, room=room),
+             ("unique_room_review_per_user", "sqlite_autoindex_hotel_roomreview")),
+            ("hotel_email_taken", Hotel.objects.filter(email=hotel.email),
+             ("hotel_hotel_email", "sqlite_autoindex_hotel_hotel")),
+            ("availability_search", available_rooms(
+                Room.objects.filter(hotel__city=hotel.city, status="available"), check_in, check_out
+            ), ("booking_overlap_idx",)),
+        ]
+
+    @staticmethod
+    def _measure(name, queryset, expected_indexes, repeat):
+        plan = queryset.explain()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            list(queryset.values_list("pk", flat=True))
+        elapsed = time.perf_counter() - started
+        return {
+            "name": name,
+            "plan": plan,
+            "expected_indexes": list(expected_indexes),
+            "mean_ms": elapsed / repeat * 1000,
+            "regressed": not any(index in plan for index in expected_indexes),
+        }
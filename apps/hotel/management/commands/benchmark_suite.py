@@ -0,0 +1,259 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+
+from apps.blogs.models import Category, Comment, Like, Post, Tag
+from apps.blogs.serializers import PostSerializer
+from core.fast_serializers import fast_serializer
+from core.query_budget import record_queries
+from apps.hotel.cache import clear_room_details
+from apps.hotel.models import Amenity, Booking, CustomUser, Hotel, Room, RoomReview, RoomType
+from apps.hotel.serializer import RoomDetailSerializer, RoomSerializer, RoomsBookingsSerializer
+
+
+def sizes(value):
+    return [int(size) for size in value.split(",")]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Time serializer rendering, validation and full requests on seeded data of several sizes. "
+        "Every scenario runs in a rolled-back transaction; results can be written as JSON and "
+        "compared against a previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rooms-per-hotel", type=sizes, default=[10, 100])
+        parser.add_argument("--reviews-per-room", type=sizes, default=[0, 20])
+        parser.add_argument("--bookings-per-room", type=sizes, default=[0, 50])
+        parser.add_argument("--likes-per-post", type=sizes, default=[0, 200])
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--output", help="Write results as JSON to this path")
+        parser.add_argument("--compare", help="JSON results of an earlier run to diff against")
+
+    def handle(self, *args, **options):
+        self.repeat = options["repeat"]
+        self.results = []
+        # The test client talks to "testserver".
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for rooms in options["rooms_per_hotel"]:
+                for reviews in options["reviews_per_room"]:
+                    self._scenario(self._rooms_scenario, rooms=rooms, reviews=reviews)
+            for bookings in options["bookings_per_room"]:
+                self._scenario(self._bookings_scenario, bookings=bookings)
+            for likes in options["likes_per_post"]:
+                self._scenario(self._posts_scenario, likes=likes)
+
+        baseline = self._load_baseline(options["compare"])
+        for result in self.results:
+            key = (result["name"], json.dumps(result["params"], sort_keys=True))
+            line = f"{result['name']:<36} {json.dumps(result['params']):<48} {result['median_ms']:9.2f}ms {result['queries']:4d}q"
+            if key in baseline and baseline[key]:
+                line += f"  {(result['median_ms'] / baseline[key] - 1) * 100:+6.1f}%"
+            self.stdout.write(line)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as handle:
+                json.dump(self._report(), handle, indent=2)
+
+    @staticmethod
+    def _load_baseline(path):
+        if not path:
+            return {}
+        with open(path, encoding="utf-8") as handle:
+            report = json.load(handle)
+        return {
+            (result["name"], json.dumps(result["params"], sort_keys=True)): result["median_ms"]
+            for result in report["results"]
+        }
+
+    def _report(self):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            "commit": commit,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": self.repeat,
+            "results": self.results,
+        }
+
+    def _scenario(self, scenario, **params):
+        try:
+            with transaction.atomic():
+                scenario(**params)
+                raise _Rollback
+        except _Rollback:
+            pass
+        clear_room_details()
+
+    def _time(self, name, params, func, setup=None):
+        timings = []
+        # Warm-up run; it also counts queries (the test client resets
+        # ``connection.queries`` on every request, so use an execute wrapper).
+        with record_queries() as recorder:
+            func()
+        for _ in range(self.repeat):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        self.results.append({
+            "name": name,
+            "params": params,
+            "min_ms": round(min(timings), 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "queries": recorder.count,
+        })
+
+    @staticmethod
+    def _user(username):
+        return CustomUser.objects.create(username=username, phone_number="+998901234567")
+
+    def _hotel(self):
+        return Hotel.objects.create(
+            name="Benchmark Hotel", description="d", address="a", city="Tashkent", country="Uzbekistan",
+            star_rating=4, phone="+998901234567", email="benchmark-suite@example.com",
+        )
+
+    def _rooms(self, hotel, count):
+        room_type = RoomType.objects.create(name="Benchmark", description="d")
+        amenities = Amenity.objects.bulk_create([Amenity(name=f"amenity {i}", icon="i") for i in range(5)])
+        rooms = Room.objects.bulk_create(
+            Room(
+                hotel=hotel, room_number=str(i), room_type=room_type, price_per_night=Decimal("90.00"),
+                discount_percentage=i % 2 * 10, capacity=2, floor=1, description="d",
+            )
+            for i in range(count)
+        )
+        through = Room.amenities.through
+        through.objects.bulk_create(
+            through(room_id=room.pk, amenity_id=amenity.pk) for room in rooms for amenity in amenities
+        )
+        return rooms
+
+    def _rooms_scenario(self, rooms, reviews):
+        params = {"rooms_per_hotel": rooms, "reviews_per_room": reviews}
+        hotel = self._hotel()
+        room_list = self._rooms(hotel, rooms)
+        reviewers = CustomUser.objects.bulk_create(
+            CustomUser(username=f"reviewer{i}", phone_number="+998901234567") for i in range(reviews)
+        )
+        RoomReview.objects.bulk_create(
+            RoomReview(
+                room=room, user=user, cleanliness_rating=4, comfort_rating=5, service_rating=3,
+                overall_rating=4, comment="Benchmark review text",
+            )
+            for room in room_list
+            for user in reviewers
+        )
+        Room.objects.filter(hotel=hotel).update(
+            reviews_count=reviews, cleanliness_rating_sum=4 * reviews, comfort_rating_sum=5 * reviews,
+            service_rating_sum=3 * reviews, overall_rating_sum=4 * reviews,
+        )
+
+        listed = list(RoomSerializer.setup_eager_loading(Room.objects.filter(hotel=hotel)))
+        self._time("serialize RoomSerializer list", params, lambda: RoomSerializer(listed, many=True).data)
+        self._time("serialize RoomSerializer list fast", params, lambda: fast_serializer(RoomSerializer).many(listed))
+        detail = Room.objects.select_related("hotel", "room_type").prefetch_related(
+            "amenities", "reviews__user"
+        ).get(pk=room_list[0].pk)
+        self._time("serialize RoomDetailSerializer", params, lambda: RoomDetailSerializer(detail).data)
+        self._time("serialize RoomDetailSerializer fast", params, lambda: fast_serializer(RoomDetailSerializer)(detail))
+
+        client = Client()
+        self._time(
+            "request GET rooms/", params,
+            lambda: client.get("/hotel/rooms/", {"page_size": 100}),
+        )
+        self._time(
+            "request GET rooms-detail/<pk>/ cold", params,
+            lambda: client.get(f"/hotel/rooms-detail/{room_list[0].pk}/"), setup=clear_room_details,
+        )
+
+    def _bookings_scenario(self, bookings):
+        params = {"bookings_per_room": bookings}
+        user = self._user("benchmark_guest")
+        room = self._rooms(self._hotel(), 1)[0]
+        start = date(2030, 1, 1)
+        Booking.objects.bulk_create(
+            Booking(
+                room=room, user=user, check_in=start + timedelta(days=3 * i),
+                check_out=start + timedelta(days=3 * i + 2), guests_count=1, total_price=Decimal("180.00"),
+                status="confirmed",
+            )
+            for i in range(bookings)
+        )
+        free_from = start + timedelta(days=3 * bookings + 10)
+        payload = {"check_in": free_from.isoformat(), "check_out": (free_from + timedelta(days=2)).isoformat(), "guests_count": 1}
+
+        def validate():
+            serializer = RoomsBookingsSerializer(data=payload, context={"room": room, "user": user})
+            serializer.is_valid(raise_exception=True)
+
+        self._time("validate RoomsBookingsSerializer", params, validate)
+
+        client = Client()
+        nights = iter(range(10 ** 6))
+
+        def book():
+            check_in = free_from + timedelta(days=5 + 2 * next(nights))
+            client.post(f"/hotel/rooms/{room.pk}/bookings/", {
+                "check_in": check_in.isoformat(), "check_out": (check_in + timedelta(days=1)).isoformat(),
+                "guests_count": 1,
+            })
+
+        self._time("request POST rooms/<pk>/bookings/", params, book)
+
+    def _posts_scenario(self, likes):
+        params = {"likes_per_post": likes}
+        author = self._user("benchmark_author")
+        category = Category.objects.create(name="Benchmark", slug="benchmark-suite", description="d")
+        tags = Tag.objects.bulk_create(Tag(name=f"tag{i}", slug=f"benchmark-suite-{i}") for i in range(5))
+        post = Post.objects.create(
+            title="Benchmark", slug="benchmark-suite", author=author, category=category,
+            content="word " * 2000, excerpt="e", status="published",
+        )
+        post.tags.set(tags)
+        likers = CustomUser.objects.bulk_create(
+            CustomUser(username=f"liker{i}", phone_number="+998901234567") for i in range(likes)
+        )
+        Like.objects.bulk_create(Like(post=post, user=user) for user in likers)
+        Comment.objects.bulk_create(Comment(post=post, user=author, content="c") for _ in range(10))
+
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        loaded = Post.objects.select_related("author", "category").prefetch_related("tags").get(pk=post.pk)
+        self._time(
+            "serialize PostSerializer", params,
+            lambda: PostSerializer(loaded, context={"request": request}).to_representation(loaded),
+        )
+        self._time(
+            "serialize PostSerializer fast", params,
+            lambda: fast_serializer(PostSerializer)(loaded, context={"request": request}),
+        )
+
+        client = Client()
+        self._time("request POST post-detail/", params, lambda: client.post("/blogs/post-detail/", {"id": post.pk}))
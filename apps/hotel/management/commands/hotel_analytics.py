@@ -0,0 +1,36 @@
+import csv
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.hotel.analytics import daily_hotel_metrics
+from apps.hotel.models import Hotel
+
+
+class Command(BaseCommand):
+    help = "Print daily occupancy, ADR and RevPAR for a hotel over [start, end) as CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("hotel", type=int)
+        parser.add_argument("--start", type=date.fromisoformat, required=True)
+        parser.add_argument("--end", type=date.fromisoformat, required=True)
+
+    def handle(self, *args, **options):
+        if not Hotel.objects.filter(pk=options["hotel"]).exists():
+            raise CommandError(f"Hotel {options['hotel']} does not exist")
+        if options["end"] <= options["start"]:
+            raise CommandError("--end must be after --start")
+
+        started = time.perf_counter()
+        try:
+            metrics = daily_hotel_metrics(options["hotel"], options["start"], options["end"])
+        except RuntimeError as exc:
+            raise CommandError(exc)
+        elapsed = time.perf_counter() - started
+
+        writer = csv.DictWriter(self.stdout, fieldnames=["date", "occupied", "occupancy", "revenue", "adr", "revpar"])
+        writer.writeheader()
+        writer.writerows(metrics["days"])
+        summary = ", ".join(f"{key}={value}" for key, value in metrics["summary"].items())
+        self.stderr.write(f"{summary} ({elapsed * 1000:.0f}ms)")
@@ -0,0 +1,190 @@
+import json
+from collections import defaultdict
+from contextlib import ExitStack
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from apps.hotel.availability import ACTIVE_STATUSES, RoomIntervals, availability_index
+from apps.hotel.calendars import invalidate_room_calendars
+from apps.hotel.models import Booking, CustomUser, Room
+from apps.hotel.pricing import PRICE_FIELDS, quote_stays
+from core.bulk_io import ID_CHUNK, batched, chunked, read_rows
+
+
+STATUSES = {value for value, _ in Booking.STATUS_CHOICES}
+
+
+def parse_row(raw, fmt):
+    row = raw if fmt == "csv" else json.loads(raw)
+    check_in = date.fromisoformat(row["check_in"])
+    check_out = date.fromisoformat(row["check_out"])
+    if check_out <= check_in:
+        raise ValueError("check_out must be after check_in")
+    status = row.get("status") or "pending"
+    if status not in STATUSES:
+        raise ValueError(f"unknown status {status!r}")
+    total_price = row.get("total_price")
+    return {
+        "room_id": int(row["room"]),
+        "user_id": int(row["user"]),
+        "check_in": check_in,
+        "check_out": check_out,
+        "guests_count": int(row["guests_count"]),
+        "total_price": Decimal(str(total_price)) if total_price not in (None, "") else None,
+        "status": status,
+        "special_requests": row.get("special_requests") or None,
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Import bookings from a CSV or JSONL file, --batch-size rows at a time. Each batch locks its "
+        "rooms like reserve_room does, then rejects rows that overlap an existing booking or another row "
+        "of the batch with a per-room sort-and-sweep pass."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "jsonl"), help="Defaults to the file extension")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--rejects", help="Write rejected rows with their reason to this JSONL file")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+        # A dry run writes nothing, so rows it would have imported are remembered for later batches.
+        self.planned = defaultdict(list) if options["dry_run"] else None
+        imported = rejected = 0
+        shown = []
+
+        try:
+            with ExitStack() as stack:
+                rejects = None
+                if options["rejects"]:
+                    rejects = stack.enter_context(open(options["rejects"], "w", encoding="utf-8"))
+                for batch in batched(read_rows(path, fmt), options["batch_size"]):
+                    accepted, batch_rejected = self._import_batch(batch, fmt)
+                    imported += accepted
+                    rejected += len(batch_rejected)
+                    for line_no, reason in sorted(batch_rejected):
+                        if rejects:
+                            rejects.write(json.dumps({"line": line_no, "reason": reason}) + "\n")
+                        elif len(shown) < 50:
+                            shown.append(f"line {line_no}: {reason}")
+        except OSError as exc:
+            raise CommandError(exc)
+
+        for line in shown:
+            self.stderr.write(line)
+        verb = "Would import" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {imported} bookings, rejected {rejected} rows"))
+
+    def _import_batch(self, batch, fmt):
+        rejected = []
+        by_room = defaultdict(list)
+        for line_no, raw in batch:
+            try:
+                row = parse_row(raw, fmt)
+            except (KeyError, TypeError, ValueError, InvalidOperation) as exc:
+                rejected.append((line_no, f"invalid row: {exc}"))
+                continue
+            by_room[row["room_id"]].append((line_no, row))
+        users = self._load_users(row for rows in by_room.values() for _, row in rows)
+
+        with transaction.atomic():
+            rooms = self._lock_rooms(by_room)
+            existing = self._load_existing(rooms)
+            accepted = []
+            for room_id, rows in by_room.items():
+                if room_id not in rooms:
+                    rejected.extend((line_no, f"room {room_id} does not exist") for line_no, _ in rows)
+                    continue
+                if self.planned is not None:
+                    existing[room_id] += self.planned[room_id]
+                accepted.extend(self._sweep(rows, existing[room_id], users, rejected))
+
+            unpriced = [booking for booking in accepted if booking.total_price is None]
+            quotes = quote_stays(
+                [(booking.room_id, booking.check_in, booking.check_out) for booking in unpriced], rooms=rooms
+            )
+            for booking, quote in zip(unpriced, quotes):
+                booking.total_price = quote["total_price"]
+
+            if self.planned is not None:
+                for booking in accepted:
+                    if booking.status in ACTIVE_STATUSES:
+                        self.planned[booking.room_id].append((booking.check_in, booking.check_out, 0))
+            elif accepted:
+                self._write(accepted)
+        return len(accepted), rejected
+
+    @staticmethod
+    def _lock_rooms(by_room):
+        """Lock the batch's rooms in id order, as ``reserve_room`` locks one."""
+        rooms = {}
+        for ids in chunked(sorted(by_room), ID_CHUNK):
+            rooms.update(
+                (room.pk, room)
+                for room in Room.objects.select_for_update().only(*PRICE_FIELDS).filter(pk__in=ids).order_by("pk")
+            )
+        return rooms
+
+    @staticmethod
+    def _load_users(rows):
+        ids = {row["user_id"] for row in rows}
+        found = set()
+        for chunk in chunked(ids, ID_CHUNK):
+            found.update(CustomUser.objects.filter(pk__in=chunk).values_list("pk", flat=True))
+        return found
+
+    @staticmethod
+    def _load_existing(rooms):
+        existing = defaultdict(list)
+        for ids in chunked(rooms, ID_CHUNK):
+            rows = Booking.objects.filter(room_id__in=ids, status__in=ACTIVE_STATUSES).values_list(
+                "room_id", "check_in", "check_out", "id"
+            )
+            for room_id, check_in, check_out, booking_id in rows:
+                existing[room_id].append((check_in, check_out, booking_id))
+        return existing
+
+    @staticmethod
+    def _sweep(rows, existing, users, rejected):
+        booked = RoomIntervals(existing)
+        latest_check_out = None
+        accepted = []
+        for line_no, row in sorted(rows, key=lambda item: (item[1]["check_in"], item[1]["check_out"], item[0])):
+            if row["user_id"] not in users:
+                rejected.append((line_no, f"user {row['user_id']} does not exist"))
+                continue
+            if row["status"] in ACTIVE_STATUSES:
+                if booked.overlaps(row["check_in"], row["check_out"]):
+                    rejected.append((line_no, "overlaps an existing booking"))
+                    continue
+                if latest_check_out is not None and latest_check_out > row["check_in"]:
+                    rejected.append((line_no, "overlaps another row in the file"))
+                    continue
+                latest_check_out = row["check_out"]
+            accepted.append(Booking(**row))
+        return accepted
+
+    @staticmethod
+    def _write(bookings):
+        Booking.objects.bulk_create(bookings)
+        touched = sorted({booking.room_id for booking in bookings})
+        # bulk_create sends no signals: bump versions so a reserve_room that read the room
+        # before this batch retries, and drop this process's cached availability and calendars.
+        for ids in chunked(touched, ID_CHUNK):
+            Room.objects.filter(pk__in=ids).update(booking_version=F("booking_version") + 1)
+        invalidate_room_calendars(touched)
+
+        def forget_rooms():
+            for room_id in touched:
+                availability_index.invalidate(room_id)
+
+        transaction.on_commit(forget_rooms)
@@ -0,0 +1,112 @@
+import json
+import os
+import time
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import transaction
+from rest_framework import serializers
+
+from apps.blogs.models import BlogProfile
+from apps.hotel.models import CustomUser
+from apps.hotel.passwords import hash_passwords
+from apps.hotel.serializer import RegisterSerializer
+from core.bulk_io import ID_CHUNK, chunked, read_rows
+
+
+FIELDS = ("username", "email", "first_name", "last_name", "phone_number")
+
+
+def parse_row(raw, fmt):
+    row = raw if fmt == "csv" else json.loads(raw)
+    user = {field: (row.get(field) or "").strip() for field in FIELDS}
+    if not user["username"]:
+        raise ValueError("username is required")
+    RegisterSerializer.validate_username(user["username"])
+    if user["email"]:
+        validate_email(user["email"])
+    if user["phone_number"]:
+        RegisterSerializer.validate_phone_number(user["phone_number"])
+    return user, row.get("password") or None, (row.get("bio") or "").strip() or None
+
+
+class Command(BaseCommand):
+    help = (
+        "Import users (and blog profiles for rows with a bio) from a CSV or JSONL file. Passwords "
+        "are hashed on a process pool and rows are written with bulk_create."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "jsonl"), help="Defaults to the file extension")
+        parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Hashing processes")
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument("--rejects", help="Write rejected rows with their reason to this JSONL file")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+        rejected = []
+        rows = {}
+
+        try:
+            for line_no, raw in read_rows(path, fmt):
+                try:
+                    user, password, bio = parse_row(raw, fmt)
+                except serializers.ValidationError as exc:
+                    rejected.append((line_no, f"invalid row: {' '.join(map(str, exc.detail))}"))
+                    continue
+                except DjangoValidationError as exc:
+                    rejected.append((line_no, f"invalid row: {' '.join(exc.messages)}"))
+                    continue
+                except (TypeError, ValueError) as exc:
+                    rejected.append((line_no, f"invalid row: {exc}"))
+                    continue
+                if user["username"] in rows:
+                    rejected.append((line_no, f"username {user['username']} repeats line {rows[user['username']][0]}"))
+                    continue
+                rows[user["username"]] = (line_no, user, password, bio)
+        except OSError as exc:
+            raise CommandError(exc)
+
+        for usernames in chunked(rows, ID_CHUNK):
+            for taken in CustomUser.objects.filter(username__in=usernames).values_list("username", flat=True):
+                rejected.append((rows.pop(taken)[0], f"username {taken} already exists"))
+
+        accepted = list(rows.values())
+        started = time.perf_counter()
+        hashes = [] if options["dry_run"] else hash_passwords(
+            [password for _, _, password, _ in accepted], workers=options["workers"]
+        )
+        hashed_in = time.perf_counter() - started
+
+        if not options["dry_run"]:
+            self._write(accepted, hashes, options["batch_size"])
+
+        if options["rejects"]:
+            with open(options["rejects"], "w", encoding="utf-8") as handle:
+                for line_no, reason in sorted(rejected):
+                    handle.write(json.dumps({"line": line_no, "reason": reason}) + "\n")
+        else:
+            for line_no, reason in sorted(rejected)[:50]:
+                self.stderr.write(f"line {line_no}: {reason}")
+
+        verb = "Would import" if options["dry_run"] else "Imported"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(accepted)} users, rejected {len(rejected)} rows (hashing took {hashed_in:.1f}s)"
+        ))
+
+    @staticmethod
+    def _write(accepted, hashes, batch_size):
+        for batch in chunked(zip(accepted, hashes), batch_size):
+            with transaction.atomic():
+                users = CustomUser.objects.bulk_create(
+                    CustomUser(password=hashed, **user) for (_, user, _, _), hashed in batch
+                )
+                BlogProfile.objects.bulk_create(
+                    BlogProfile(user=created, bio=bio)
+                    for created, ((_, _, _, bio), _) in zip(users, batch)
+                    if bio
+                )
@@ -0,0 +1,21 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.hotel.search import FTS_TABLES, rebuild_search_index, search_available
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search indexes of hotels, rooms and reviews from their tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--no-optimize", action="store_true", help="Skip merging index segments afterwards")
+
+    def handle(self, *args, **options):
+        if not search_available():
+            raise CommandError("Full-text search needs the SQLite FTS5 index")
+        started = time.perf_counter()
+        rebuild_search_index(optimize=not options["no_optimize"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {', '.join(FTS_TABLES.values())} in {time.perf_counter() - started:.1f}s"
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.hotel.cache import clear_room_details
+from apps.hotel.models import Room
+from apps.hotel.ratings import recompute_room_ratings
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored review counts and rating sums on every room from RoomReview."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--hotel", type=int, help="Only recompute rooms of this hotel id")
+
+    def handle(self, *args, **options):
+        rooms = Room.objects.all()
+        if options["hotel"]:
+            rooms = rooms.filter(hotel_id=options["hotel"])
+        with transaction.atomic():
+            updated = recompute_room_ratings(rooms)
+        clear_room_details()
+        self.stdout.write(self.style.SUCCESS(f"Recomputed ratings for {updated} rooms"))
@@ -0,0 +1,240 @@
+import random
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.blogs.models import BlogProfile, BookmarkList, Category, Comment, Like, Post, Tag, fill_comment_paths, reading_stats
+from apps.hotel.availability import availability_index
+from apps.hotel.cache import clear_room_details
+from apps.hotel.calendars import clear_room_calendars
+from apps.hotel.models import Amenity, Booking, CustomUser, Hotel, Room, RoomReview, RoomType
+from apps.hotel.pricing import CENT
+
+
+WORDS = (
+    "sea view quiet breakfast pool spa city centre balcony suite garden terrace river old town "
+    "airport shuttle family business mountain lake beach market museum night walk coffee fresh"
+).split()
+CITIES = ("Tashkent", "Samarkand", "Bukhara", "Khiva", "Fergana", "Namangan", "Andijan", "Nukus")
+BOOKING_STATUSES = ("pending", "confirmed", "cancelled", "completed")
+BOOKING_WEIGHTS = (1, 5, 1, 3)
+# Never matches a hash, like ``set_unusable_password`` - but deterministic and free.
+SYNTHETIC_PASSWORD = f"{UNUSABLE_PASSWORD_PREFIX}seed"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic hotel and blog data set with bulk_create in chunks. The same --seed "
+        "always produces the same data; synthetic users get an unusable password so nothing is hashed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--hotels", type=int, default=100)
+        parser.add_argument("--rooms-per-hotel", type=int, default=20)
+        parser.add_argument("--bookings-per-room", type=int, default=20)
+        parser.add_argument("--reviews-per-room", type=int, default=5)
+        parser.add_argument("--posts", type=int, default=500)
+        parser.add_argument("--comments-per-post", type=int, default=10)
+        parser.add_argument("--likes-per-post", type=int, default=20)
+        parser.add_argument("--bookmark-lists", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--tag", help="Prefix for unique values (usernames, emails, slugs); defaults to s<seed>")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.tag = options["tag"] or f"s{options['seed']}"
+        self.batch_size = options["batch_size"]
+        self.options = options
+        self.counts = {}
+        started = time.perf_counter()
+
+        self.user_ids = self._seed_users()
+        self._seed_hotels()
+        self._seed_blogs()
+
+        # bulk_create skips the signals that keep these in sync.
+        availability_index.invalidate()
+        clear_room_details()
+        clear_room_calendars()
+        for name, count in self.counts.items():
+            self.stdout.write(f"{name:<16} {count:>12,}")
+        self.stdout.write(self.style.SUCCESS(f"Seeded in {time.perf_counter() - started:.1f}s"))
+
+    def _create(self, model, objects):
+        """``bulk_create`` one chunk in its own transaction and count it."""
+        if not objects:
+            return []
+        with transaction.atomic():
+            created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(created)
+        return created
+
+    def _buffered(self, model, objects, buffer):
+        buffer.extend(objects)
+        if len(buffer) >= self.batch_size:
+            self._create(model, buffer)
+            buffer.clear()
+
+    def _text(self, words):
+        return " ".join(self.random.choices(WORDS, k=words))
+
+    def _seed_users(self):
+        user_ids = []
+        for start in range(0, self.options["users"], self.batch_size):
+            users = [
+                CustomUser(
+                    username=f"{self.tag}-user{i}", password=SYNTHETIC_PASSWORD,
+                    email=f"{self.tag}-user{i}@example.com", phone_number=f"+99890{i % 10 ** 7:07d}",
+                )
+                for i in range(start, min(start + self.batch_size, self.options["users"]))
+            ]
+            created = self._create(CustomUser, users)
+            self._create(BlogProfile, [BlogProfile(user=user, bio=self._text(6)) for user in created])
+            user_ids.extend(user.pk for user in created)
+        return user_ids
+
+    def _seed_hotels(self):
+        options = self.options
+        room_types = self._create(RoomType, [
+            RoomType(name=name, description=self._text(12)) for name in ("Single", "Double", "Suite", "Family")
+        ])
+        amenities = self._create(Amenity, [Amenity(name=word, icon=word[:3]) for word in WORDS[:12]])
+        hotels_per_chunk = max(1, self.batch_size // max(options["rooms_per_hotel"], 1))
+
+        for start in range(0, options["hotels"], hotels_per_chunk):
+            hotels = self._create(Hotel, [
+                Hotel(
+                    name=f"Hotel {i}", description=self._text(30), address=f"{i} {self.random.choice(WORDS)} street",
+                    city=self.random.choice(CITIES), country="Uzbekistan", star_rating=self.random.randint(1, 5),
+                    phone="+998901234567", email=f"{self.tag}-hotel{i}@example.com",
+                )
+                for i in range(start, min(start + hotels_per_chunk, options["hotels"]))
+            ])
+            self._seed_rooms(hotels, room_types, amenities)
+
+    def _seed_rooms(self, hotels, room_types, amenities):
+        options = self.options
+        rooms, ratings = [], []
+        for hotel in hotels:
+            for n in range(options["rooms_per_hotel"]):
+                room = Room(
+                    hotel=hotel, room_number=f"{n // 20 + 1}{n % 20:02d}", room_type=self.random.choice(room_types),
+                    price_per_night=Decimal(self.random.randrange(4000, 40000, 500)) / 100,
+                    discount_percentage=self.random.choice((0, 0, 0, 5, 10, 20)), capacity=self.random.randint(1, 6),
+                    floor=n // 20 + 1, description=self._text(20),
+                )
+                room_ratings = [
+                    [self.random.randint(1, 5) for _ in range(4)]
+                    for _ in range(min(options["reviews_per_room"], len(self.user_ids)))
+                ]
+                # Denormalized totals are set up front instead of recomputed afterwards.
+                room.reviews_count = len(room_ratings)
+                (room.cleanliness_rating_sum, room.comfort_rating_sum,
+                 room.service_rating_sum, room.overall_rating_sum) = (
+                    [sum(column) for column in zip(*room_ratings)] if room_ratings else (0, 0, 0, 0)
+                )
+                rooms.append(room)
+                ratings.append(room_ratings)
+        rooms = self._create(Room, rooms)
+
+        through = Room.amenities.through
+        self._create(through, [
+            through(room_id=room.pk, amenity_id=amenity.pk)
+            for room in rooms
+            for amenity in self.random.sample(amenities, self.random.randint(2, 6))
+        ])
+
+        bookings, reviews = [], []
+        for room, room_ratings in zip(rooms, ratings):
+            self._buffered(Booking, self._bookings(room), bookings)
+            reviewers = self.random.sample(self.user_ids, len(room_ratings))
+            self._buffered(RoomReview, [
+                RoomReview(
+                    room_id=room.pk, user_id=user_id, cleanliness_rating=cleanliness, comfort_rating=comfort,
+                    service_rating=service, overall_rating=overall, comment=self._text(15),
+                )
+                for user_id, (cleanliness, comfort, service, overall) in zip(reviewers, room_ratings)
+            ], reviews)
+        self._create(Booking, bookings)
+        self._create(RoomReview, reviews)
+
+    def _bookings(self, room):
+        """Back-to-back stays with random gaps, so no two bookings of a room overlap."""
+        day = date(2024, 1, 1) + timedelta(days=self.random.randint(0, 30))
+        discount = Decimal(100 - room.discount_percentage) / 100
+        bookings = []
+        for _ in range(self.options["bookings_per_room"]):
+            nights = self.random.randint(1, 7)
+            bookings.append(Booking(
+                room_id=room.pk, user_id=self.random.choice(self.user_ids), check_in=day,
+                check_out=day + timedelta(days=nights), guests_count=self.random.randint(1, room.capacity),
+                total_price=(room.price_per_night * nights * discount).quantize(CENT, rounding=ROUND_HALF_UP),
+                status=self.random.choices(BOOKING_STATUSES, BOOKING_WEIGHTS)[0],
+            ))
+            day += timedelta(days=nights + self.random.randint(0, 5))
+        return bookings
+
+    def _seed_blogs(self):
+        options = self.options
+        categories = self._create(Category, [
+            Category(name=word.title(), slug=f"{self.tag}-{word}", description=self._text(10)) for word in WORDS[:8]
+        ])
+        tags = self._create(Tag, [Tag(name=word, slug=f"{self.tag}-tag-{word}") for word in WORDS])
+        if not self.user_ids:
+            return
+        epoch = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+        post_ids = []
+        for start in range(0, options["posts"], self.batch_size):
+            posts = self._create(Post, [
+                Post(
+                    title=self._text(6).capitalize(), slug=f"{self.tag}-post{i}", author_id=self.random.choice(self.user_ids),
+                    category=self.random.choice(categories), content=content, excerpt=self._text(25), status=status,
+                    view_count=self.random.randint(0, 5000), word_count=word_count, reading_time=reading_time,
+                    published_date=epoch + timedelta(minutes=self.random.randint(0, 525600)) if status == "published" else None,
+                )
+                for i in range(start, min(start + self.batch_size, options["posts"]))
+                for status in [self.random.choices(("draft", "published", "archived"), (1, 8, 1))[0]]
+                # bulk_create skips Post.save(), which fills these in.
+                for content in [self._text(self.random.randint(150, 1500))]
+                for word_count, reading_time in [reading_stats(content)]
+            ])
+            through = Post.tags.through
+            self._create(through, [
+                through(post_id=post.pk, tag_id=tag.pk) for post in posts for tag in self.random.sample(tags, 3)
+            ])
+            post_ids.extend(post.pk for post in posts)
+
+            comments, likes = [], []
+            for post in posts:
+                self._buffered(Comment, [
+                    Comment(
+                        post_id=post.pk, user_id=self.random.choice(self.user_ids), content=self._text(12),
+                        is_approved=self.random.random() < 0.9,
+                    )
+                    for _ in range(options["comments_per_post"])
+                ], comments)
+                self._buffered(Like, [
+                    Like(post_id=post.pk, user_id=user_id)
+                    for user_id in self.random.sample(self.user_ids, min(options["likes_per_post"], len(self.user_ids)))
+                ], likes)
+            self._create(Comment, comments)
+            self._create(Like, likes)
+        fill_comment_paths(Comment)
+
+        lists = self._create(BookmarkList, [
+            BookmarkList(user_id=user_id, name=f"Reading list {i}", is_public=i % 3 == 0)
+            for i, user_id in enumerate(self.user_ids[:options["bookmark_lists"]])
+        ])
+        through = BookmarkList.posts.through
+        self._create(through, [
+            through(bookmarklist_id=bookmark_list.pk, post_id=post_id)
+            for bookmark_list in lists
+            for post_id in self.random.sample(post_ids, min(5, len(post_ids)))
+        ])
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:28
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_review_totals(apps, schema_editor):
+    Room = apps.get_model("hotel", "Room")
+    RoomReview = apps.get_model("hotel", "RoomReview")
+    totals = RoomReview.objects.values("room").annotate(
+        reviews_count=Count("id"),
+        cleanliness_rating_sum=Sum("cleanliness_rating"),
+        comfort_rating_sum=Sum("comfort_rating"),
+        service_rating_sum=Sum("service_rating"),
+        overall_rating_sum=Sum("overall_rating"),
+    ).order_by()
+    for row in totals.iterator(chunk_size=2000):
+        Room.objects.filter(pk=row.pop("room")).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0003_alter_customuser_phone_number"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="cleanliness_rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="comfort_rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="overall_rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="reviews_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="room",
+            name="service_rating_sum",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_review_totals, migrations.RunPython.noop),
+    ]
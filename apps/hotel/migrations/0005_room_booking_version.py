@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0004_room_review_totals"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="room",
+            name="booking_version",
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0005_room_booking_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomRateOverride",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("price_per_night", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("room", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="rate_overrides", to="hotel.room")),
+            ],
+            options={
+                "unique_together": {("room", "date")},
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:37
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_reviews(apps, schema_editor):
+    """Refuse to add the one-review-per-user constraint over existing duplicates.
+
+    Which of a user's reviews to keep is a data decision, so the rows are
+    reported and left for an operator to resolve before migrating again.
+    """
+    reviews = apps.get_model("hotel", "RoomReview").objects.using(schema_editor.connection.alias)
+    repeated = list(
+        reviews.values("room", "user").annotate(n=Count("id")).filter(n__gt=1).order_by("room", "user")
+    )
+    if not repeated:
+        return
+    lines = []
+    for row in repeated[:50]:
+        ids = reviews.filter(room=row["room"], user=row["user"]).order_by("pk").values_list("pk", flat=True)
+        lines.append(f"  room {row['room']}, user {row['user']}: reviews {', '.join(map(str, ids))}")
+    if len(repeated) > 50:
+        lines.append(f"  ... and {len(repeated) - 50} more")
+    raise RuntimeError(
+        f"{len(repeated)} (room, user) pairs have more than one review, so unique_room_review_per_user "
+        "cannot be added. Delete the extra reviews (and run recompute_room_ratings), then migrate again:\n"
+        + "\n".join(lines)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0006_roomrateoverride"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="hotel",
+            name="email",
+            field=models.EmailField(db_index=True, max_length=254),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(fields=["room", "status", "check_in", "check_out"], name="booking_overlap_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(fields=["hotel", "status"], name="room_hotel_status_idx"),
+        ),
+        migrations.RunPython(check_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="roomreview",
+            constraint=models.UniqueConstraint(fields=("room", "user"), name="unique_room_review_per_user"),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("hotel", "0008_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(fields=["check_in"], name="booking_check_in_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="hotel",
+            index=models.Index(fields=["name"], name="hotel_name_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="room",
+            index=models.Index(fields=["room_number"], name="room_number_idx"),
+        ),
+    ]
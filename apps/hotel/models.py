@@ -18,18 +18,32 @@ class Hotel(models.Model):
     country = models.CharField(max_length=100)
     star_rating = models.IntegerField()
     phone = models.CharField(max_length=20)
-    email = models.EmailField()
+    email = models.EmailField(db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['name'], name='hotel_name_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
 
 
 class RoomType(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField()
 
+    def __str__(self):
+        return self.name
+
 
 class Amenity(models.Model):
     name = models.CharField(max_length=100)
     icon = models.CharField(max_length=50)
 
+    def __str__(self):
+        return self.name
+
 
 class Room(models.Model):
     STATUS_CHOICES = [
@@ -48,6 +62,35 @@ class Room(models.Model):
     floor = models.IntegerField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='available')
     description = models.TextField()
+    reviews_count = models.IntegerField(default=0)
+    cleanliness_rating_sum = models.IntegerField(default=0)
+    comfort_rating_sum = models.IntegerField(default=0)
+    service_rating_sum = models.IntegerField(default=0)
+    overall_rating_sum = models.IntegerField(default=0)
+    booking_version = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['hotel', 'status'], name='room_hotel_status_idx'),
+            models.Index(fields=['room_number'], name='room_number_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.hotel} #{self.room_number}"
+
+    def rating_average(self, dimension, digits=2):
+        if not self.reviews_count:
+            return 0
+        return round(getattr(self, f"{dimension}_rating_sum") / self.reviews_count, digits)
+
+
+class RoomRateOverride(models.Model):
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='rate_overrides')
+    date = models.DateField()
+    price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        unique_together = ('room', 'date')
 
 
 class Booking(models.Model):
@@ -68,6 +111,12 @@ class Booking(models.Model):
     special_requests = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['room', 'status', 'check_in', 'check_out'], name='booking_overlap_idx'),
+            models.Index(fields=['check_in'], name='booking_check_in_idx'),
+        ]
+
 
 class RoomReview(models.Model):
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='reviews')
@@ -78,3 +127,8 @@ class RoomReview(models.Model):
     overall_rating = models.IntegerField()  # 1-5
     comment = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'user'], name='unique_room_review_per_user'),
+        ]
@@ -0,0 +1,37 @@
+"""Password hashing spread over a process pool.
+
+Each hash is deliberately slow (hundreds of thousands of PBKDF2 rounds by
+default), so bulk imports hash in worker processes instead of a serial
+loop. ``make_password`` in the workers uses the same ``PASSWORD_HASHERS``
+as the web process.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+
+
+def _init_worker(settings_module):
+    # Needed with the "spawn" start method; a no-op for forked workers.
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def _hash_chunk(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def hash_passwords(passwords, workers=None, chunk_size=200):
+    """Hash ``passwords`` in order; ``None`` or ``""`` gives an unusable password.
+
+    ``workers=1`` hashes in-process, which is what tests and tiny imports want.
+    """
+    passwords = [password or None for password in passwords]
+    if workers == 1 or len(passwords) <= chunk_size:
+        return _hash_chunk(passwords)
+    chunks = [passwords[start:start + chunk_size] for start in range(0, len(passwords), chunk_size)]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(os.environ["DJANGO_SETTINGS_MODULE"],)
+    ) as pool:
+        return [hashed for chunk in pool.map(_hash_chunk, chunks) for hashed in chunk]
@@ -0,0 +1,82 @@
+from bisect import bisect_left
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+from apps.hotel.models import Room, RoomRateOverride
+from core.bulk_io import ID_CHUNK, chunked
+
+
+CENT = Decimal("0.01")
+PRICE_FIELDS = ("id", "price_per_night", "discount_percentage")
+
+
+def _load_overrides(ranges):
+    """Overrides of each room in ``{room_id: (first_night, last_checkout)}`` within its own range."""
+    overrides = defaultdict(list)
+    for ids in chunked(ranges, ID_CHUNK):
+        rows = RoomRateOverride.objects.filter(reduce(or_, (
+            Q(room_id=room_id, date__gte=ranges[room_id][0], date__lt=ranges[room_id][1]) for room_id in ids
+        ))).order_by("room_id", "date").values_list("room_id", "date", "price_per_night")
+        for room_id, night, price in rows:
+            overrides[room_id].append((night, price))
+    return overrides
+
+
+def quote_stays(stays, rooms=None):
+    """Price many ``(room_id, check_in, check_out)`` stays in one batch.
+
+    Rooms (unless already given as a ``{id: room}`` mapping) and their
+    per-date overrides take one query each per ``ID_CHUNK`` rooms, and a
+    room's overrides are read only between its earliest check-in and
+    latest check-out. Each stay costs the base rate for every night, corrected by
+    the overrides that fall inside it, minus the room discount. Totals are
+    exact ``Decimal`` values rounded to cents; stays for unknown rooms come
+    back with ``total_price`` set to ``None``.
+    """
+    stays = list(stays)
+    if not stays:
+        return []
+    if rooms is None:
+        rooms = {}
+        for ids in chunked({room_id for room_id, _, _ in stays}, ID_CHUNK):
+            rooms.update(Room.objects.only(*PRICE_FIELDS).in_bulk(ids))
+    ranges = {}
+    for room_id, check_in, check_out in stays:
+        if room_id in rooms:
+            first, last = ranges.get(room_id, (check_in, check_out))
+            ranges[room_id] = (min(first, check_in), max(last, check_out))
+    overrides = _load_overrides(ranges) if ranges else {}
+
+    quotes = []
+    for room_id, check_in, check_out in stays:
+        nights = (check_out - check_in).days
+        room = rooms.get(room_id)
+        quote = {"room": room_id, "check_in": check_in, "check_out": check_out, "nights": nights}
+        if room is None:
+            quotes.append({**quote, "subtotal": None, "discount_percentage": None, "total_price": None})
+            continue
+
+        subtotal = room.price_per_night * nights
+        room_overrides = overrides.get(room_id, ())
+        start = bisect_left(room_overrides, (check_in,))
+        for night, price in room_overrides[start:]:
+            if night >= check_out:
+                break
+            subtotal += price - room.price_per_night
+
+        discount = Decimal(room.discount_percentage) / Decimal("100")
+        quotes.append({
+            **quote,
+            "subtotal": subtotal.quantize(CENT, rounding=ROUND_HALF_UP),
+            "discount_percentage": room.discount_percentage,
+            "total_price": (subtotal * (Decimal("1") - discount)).quantize(CENT, rounding=ROUND_HALF_UP),
+        })
+    return quotes
+
+
+def quote_stay(room, check_in, check_out):
+    return quote_stays([(room.pk, check_in, check_out)], rooms={room.pk: room})[0]["total_price"]
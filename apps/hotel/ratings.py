@@ -0,0 +1,52 @@
+from django.db.models import Count, F, Sum
+
+from apps.hotel.models import Room, RoomReview
+
+
+RATING_DIMENSIONS = ("cleanliness", "comfort", "service", "overall")
+
+
+def review_totals(review, sign=1):
+    totals = {
+        f"{dimension}_rating_sum": sign * getattr(review, f"{dimension}_rating")
+        for dimension in RATING_DIMENSIONS
+    }
+    totals["reviews_count"] = sign
+    return totals
+
+
+def apply_review_delta(room_id, delta):
+    delta = {field: value for field, value in delta.items() if value}
+    if delta:
+        Room.objects.filter(pk=room_id).update(
+            **{field: F(field) + value for field, value in delta.items()}
+        )
+
+
+def recompute_room_ratings(rooms=None):
+    """Rebuild the stored review totals from ``RoomReview`` rows.
+
+    Returns the number of rooms written.
+    """
+    rooms = Room.objects.all() if rooms is None else rooms
+    aggregates = {
+        row.pop("room"): row
+        for row in RoomReview.objects.filter(room__in=rooms).values("room").annotate(
+            reviews_count=Count("id"),
+            **{f"{d}_rating_sum": Sum(f"{d}_rating") for d in RATING_DIMENSIONS},
+        ).order_by()
+    }
+    empty = {"reviews_count": 0, **{f"{d}_rating_sum": 0 for d in RATING_DIMENSIONS}}
+    fields = list(empty)
+    batch = []
+    updated = 0
+    for room in rooms.only("id", *fields).iterator(chunk_size=2000):
+        for field, value in aggregates.get(room.pk, empty).items():
+            setattr(room, field, value)
+        batch.append(room)
+        if len(batch) >= 2000:
+            updated += Room.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        updated += Room.objects.bulk_update(batch, fields)
+    return updated
@@ -0,0 +1,63 @@
+import random
+import time
+
+from django.db import OperationalError, transaction
+from django.db.models import F
+
+from apps.hotel.availability import overlapping_bookings
+from apps.hotel.models import Booking, Room
+from apps.hotel.pricing import quote_stay
+
+
+class RoomUnavailable(Exception):
+    pass
+
+
+class RoomBusy(Exception):
+    pass
+
+
+class _VersionConflict(Exception):
+    pass
+
+
+def reserve_room(room_id, user, check_in, check_out, attempts=8, **extra):
+    """Create a booking for ``room_id`` without racing other reservations.
+
+    Work is serialized per room: the room row is locked with
+    ``select_for_update`` (a no-op on SQLite) and its ``booking_version`` is
+    bumped with a compare-and-set, so two transactions that both saw the
+    room as free cannot both commit. Reservations for different rooms touch
+    different rows and do not wait on each other. A lost compare-and-set or
+    a locked database is retried with jittered backoff.
+    """
+    for attempt in range(attempts):
+        try:
+            with transaction.atomic():
+                room = Room.objects.select_for_update().only(
+                    "id", "price_per_night", "discount_percentage", "booking_version"
+                ).get(pk=room_id)
+                if overlapping_bookings(check_in, check_out).filter(room_id=room_id).exists():
+                    raise RoomUnavailable("The room is not available for the selected dates")
+
+                booking = Booking.objects.create(
+                    room=room,
+                    user=user,
+                    check_in=check_in,
+                    check_out=check_out,
+                    total_price=quote_stay(room, check_in, check_out),
+                    **extra,
+                )
+                claimed = Room.objects.filter(pk=room_id, booking_version=room.booking_version).update(
+                    booking_version=F("booking_version") + 1
+                )
+                if not claimed:
+                    raise _VersionConflict
+                return booking
+        except OperationalError as exc:
+            if "lock" not in str(exc).lower():
+                raise
+        except _VersionConflict:
+            pass
+        time.sleep(random.uniform(0, 0.005 * 2 ** attempt))
+    raise RoomBusy("The room is being booked by someone else, please retry")
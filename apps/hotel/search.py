@@ -0,0 +1,123 @@
+"""Full-text search over hotels, rooms and reviews with SQLite FTS5.
+
+Each searchable table has an external-content FTS5 index (migration 0008)
+kept in sync by SQL triggers, so ``save()``, ``bulk_create`` and
+``QuerySet.update`` are all covered. ``search`` ranks each kind with bm25
+and returns display fields plus a snippet. Snippet text is HTML-escaped
+before the matched words are wrapped in ``<mark>``, so it is safe to
+render as HTML.
+"""
+import html
+import re
+
+from django.db import connection
+
+
+SEARCH_KINDS = ("hotels", "rooms", "reviews")
+FTS_TABLES = {
+    "hotels": "hotel_hotel_fts",
+    "rooms": "hotel_room_fts",
+    "reviews": "hotel_roomreview_fts",
+}
+SNIPPET_TOKENS = 12
+# Only the newest RANK_WINDOW matches of a kind are ranked. Below that every
+# match is considered; above it bm25 would score hundreds of thousands of rows
+# per request, so very common terms rank among recent rows instead and the
+# kind is listed under "recency_limited" in the results.
+RANK_WINDOW = 2000
+# Highlight markers FTS5 puts around matches; swapped for <mark> after escaping.
+MARK_START, MARK_END = "\x02", "\x03"
+TOKEN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or so that the this to was were with".split()
+)
+
+# (display query, its columns, index of the FTS column snippets are cut from)
+DETAILS = {
+    "hotels": ("SELECT h.id, h.name, h.city, h.country, {snippet} FROM hotel_hotel_fts AS fts "
+               "JOIN hotel_hotel AS h ON h.id = fts.rowid", ("id", "name", "city", "country", "snippet"), 3),
+    "rooms": ("SELECT r.id, r.hotel_id, r.room_number, {snippet} FROM hotel_room_fts AS fts "
+              "JOIN hotel_room AS r ON r.id = fts.rowid", ("id", "hotel", "room_number", "snippet"), 0),
+    "reviews": ("SELECT v.id, v.room_id, v.overall_rating, {snippet} FROM hotel_roomreview_fts AS fts "
+                "JOIN hotel_roomreview AS v ON v.id = fts.rowid", ("id", "room", "overall_rating", "snippet"), 0),
+}
+
+
+def search_available():
+    return connection.vendor == "sqlite"
+
+
+def match_expression(text):
+    """Turn free text into an FTS5 query in which every word must appear.
+
+    Words are quoted so FTS5 operators in user input are matched literally,
+    and stopwords are dropped unless nothing else is left.
+    """
+    words = TOKEN.findall(text.lower())
+    words = [word for word in words if word not in STOPWORDS] or words
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words)
+
+
+def _ranked(cursor, table, expression, limit):
+    """``(ranks, recency_limited)``: the best ``limit`` of the newest ``RANK_WINDOW`` matches."""
+    cursor.execute(
+        f"SELECT rowid, rank FROM {table} WHERE {table} MATCH %s ORDER BY rowid DESC LIMIT %s",
+        [expression, RANK_WINDOW + 1],
+    )
+    candidates = cursor.fetchall()
+    best = sorted(candidates[:RANK_WINDOW], key=lambda candidate: candidate[1])[:limit]
+    return dict(best), len(candidates) > RANK_WINDOW
+
+
+def highlight(snippet):
+    return html.escape(snippet).replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+def search(text, kinds=SEARCH_KINDS, limit=10):
+    """``{kind: [row, ...], "recency_limited": [kind, ...]}``, best ranked first (lower ``rank`` is better).
+
+    A kind with more than ``RANK_WINDOW`` matches is ranked among its
+    newest ``RANK_WINDOW`` only and is listed in ``recency_limited``.
+    Each kind takes two queries: rank the candidates inside the FTS index
+    alone, then join and build snippets for the few rows that are returned.
+    """
+    if not search_available():
+        raise RuntimeError("Full-text search needs the SQLite FTS5 index")
+    expression = match_expression(text)
+    results = {kind: [] for kind in kinds}
+    results["recency_limited"] = []
+    if expression is None:
+        return results
+    with connection.cursor() as cursor:
+        for kind in kinds:
+            table = FTS_TABLES[kind]
+            ranks, recency_limited = _ranked(cursor, table, expression, limit)
+            if recency_limited:
+                results["recency_limited"].append(kind)
+            if not ranks:
+                continue
+            sql, columns, snippet_column = DETAILS[kind]
+            snippet = f"snippet({table}, {snippet_column}, %s, %s, '…', %s)"
+            cursor.execute(
+                sql.format(snippet=snippet)
+                + f" WHERE {table} MATCH %s AND fts.rowid IN ({', '.join(['%s'] * len(ranks))})",
+                [MARK_START, MARK_END, SNIPPET_TOKENS, expression, *ranks],
+            )
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            for row in rows:
+                row["rank"] = ranks[row["id"]]
+                row["snippet"] = highlight(row["snippet"])
+            results[kind] = sorted(rows, key=lambda row: row["rank"])
+    return results
+
+
+def rebuild_search_index(optimize=True):
+    """Re-read every indexed table from scratch, e.g. after raw SQL writes
+    that bypassed the triggers or a restore from an older dump."""
+    with connection.cursor() as cursor:
+        for table in FTS_TABLES.values():
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+            if optimize:
+                cursor.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
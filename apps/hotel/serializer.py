@@ -1,9 +1,13 @@
 from datetime import date
-from decimal import Decimal
 from django.contrib.auth import get_user_model
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from apps.hotel.availability import is_room_available
+from apps.hotel.cache import invalidate_hotel_room_details
 from apps.hotel.models import Booking, Hotel, Amenity, RoomType, Room
+from apps.hotel.reservations import RoomBusy, RoomUnavailable, reserve_room
+from apps.hotel.search import SEARCH_KINDS
 from rest_framework import serializers
+from core.fast_serializers import fast_serializer
 from .models import RoomReview
 
 User = get_user_model()
@@ -23,10 +27,8 @@ class RegisterSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        user = User.objects.create_user(**validated_data)
-        user.set_password(validated_data['password'])
-        user.save()
-        return user
+        # create_user hashes the password and saves; nothing else to write.
+        return User.objects.create_user(**validated_data)
 
     def validate(self, attrs):
         password = attrs.get('password')
@@ -116,12 +118,102 @@ class AmenityNestedSerializer(serializers.Serializer):
     icon = serializers.CharField()
 
 
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Resolves ids from ``context["related_cache"]`` when a list serializer
+    has preloaded them, instead of issuing one ``get()`` per value."""
+
+    def to_internal_value(self, data):
+        cache = self.context.get("related_cache", {}).get(self.get_queryset().model)
+        if cache is None:
+            return super().to_internal_value(data)
+        try:
+            # Like PrimaryKeyRelatedField: int(True) would otherwise pass as pk 1.
+            if isinstance(data, bool):
+                raise TypeError
+            return cache[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class RoomListSerializer(serializers.ListSerializer):
+    related_fields = {"hotel": Hotel, "room_type": RoomType, "amenities": Amenity}
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            self._preload_related(data)
+        return super().to_internal_value(data)
+
+    def _preload_related(self, data):
+        ids = {model: set() for model in self.related_fields.values()}
+        numbers = set()
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            for field, model in self.related_fields.items():
+                values = item.get(field)
+                for value in values if isinstance(values, list) else [values]:
+                    if isinstance(value, bool):
+                        continue
+                    try:
+                        ids[model].add(int(value))
+                    except (TypeError, ValueError):
+                        pass
+            numbers.add(str(item.get("room_number")))
+
+        self._context["related_cache"] = {
+            model: model.objects.in_bulk(list(pks)) for model, pks in ids.items()
+        }
+        self._context["existing_room_numbers"] = set(
+            Room.objects.filter(hotel_id__in=ids[Hotel], room_number__in=numbers)
+            .values_list("hotel_id", "room_number")
+        )
+
+    def validate(self, attrs):
+        seen = set()
+        for item in attrs:
+            key = (item["hotel"].pk, item["room_number"])
+            if key in seen:
+                raise serializers.ValidationError(
+                    f"Room {item['room_number']} is listed more than once for hotel {item['hotel'].pk}"
+                )
+            seen.add(key)
+        return attrs
+
+    def create(self, validated_data):
+        amenities = []
+        rooms = []
+        for item in validated_data:
+            item = dict(item)
+            amenities.append(item.pop("amenities", []))
+            rooms.append(Room(**item))
+
+        through = Room.amenities.through
+        with transaction.atomic():
+            rooms = Room.objects.bulk_create(rooms, batch_size=500)
+            through.objects.bulk_create(
+                [
+                    through(room_id=room.pk, amenity_id=amenity.pk)
+                    for room, room_amenities in zip(rooms, amenities)
+                    for amenity in room_amenities
+                ],
+                batch_size=1000,
+            )
+            # bulk_create sends no post_save, and every sibling's cached rooms_count is now stale.
+            invalidate_hotel_room_details({room.hotel_id for room in rooms})
+        return list(
+            self.child.setup_eager_loading(Room.objects.filter(pk__in=[room.pk for room in rooms]))
+            .order_by("pk")
+        )
+
+
 class RoomSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
-    hotel = serializers.PrimaryKeyRelatedField(queryset=Hotel.objects.all())
+    hotel = BulkPrimaryKeyRelatedField(queryset=Hotel.objects.all())
     room_number = serializers.CharField(max_length=10)
-    room_type = serializers.PrimaryKeyRelatedField(queryset=RoomType.objects.all())
-    amenities = serializers.PrimaryKeyRelatedField(
+    room_type = BulkPrimaryKeyRelatedField(queryset=RoomType.objects.all())
+    amenities = BulkPrimaryKeyRelatedField(
         many=True, queryset=Amenity.objects.all()
     )
     price_per_night = serializers.DecimalField(max_digits=10, decimal_places=2)
@@ -137,6 +229,9 @@ class RoomSerializer(serializers.Serializer):
     average_rating = serializers.SerializerMethodField(read_only=True)
     created_at = serializers.DateTimeField(read_only=True)
 
+    class Meta:
+        list_serializer_class = RoomListSerializer
+
     def create(self, validated_data):
         amenities_ids = validated_data.pop("amenities", [])
 
@@ -163,12 +258,15 @@ class RoomSerializer(serializers.Serializer):
 
     @staticmethod
     def get_reviews_count(obj):
-        return obj.reviews.count()
+        return obj.reviews_count
 
     @staticmethod
     def get_average_rating(obj):
-        avg = obj.reviews.aggregate(Avg("overall_rating"))["overall_rating__avg"]
-        return round(avg or 0, 1)
+        return obj.rating_average("overall", digits=1)
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        return queryset.select_related("hotel", "room_type").prefetch_related("amenities")
 
     def update(self, instance, validated_data):
         amenities_ids = validated_data.pop("amenities", None)
@@ -182,23 +280,40 @@ class RoomSerializer(serializers.Serializer):
         return instance
 
     def to_representation(self, instance):
-        data = super().to_representation(instance)
+        return self.finalize_representation(instance, super().to_representation(instance))
 
-        data["hotel"] = HotelNestedSerializer(instance.hotel).data
-        data["room_type"] = RoomTypeNestedSerializer(instance.room_type).data
-        data["amenities"] = AmenityNestedSerializer(instance.amenities.all(), many=True).data
+    @staticmethod
+    def finalize_representation(instance, data):
+        data["hotel"] = fast_serializer(HotelNestedSerializer)(instance.hotel)
+        data["room_type"] = fast_serializer(RoomTypeNestedSerializer)(instance.room_type)
+        data["amenities"] = fast_serializer(AmenityNestedSerializer).many(instance.amenities.all())
 
         if instance.discount_percentage == 0:
             data.pop("discount_percentage", None)
 
         return data
 
-
     def validate(self, attrs):
-        if Room.objects.filter(room_number=attrs).exists():
+        hotel = attrs.get("hotel", getattr(self.instance, "hotel", None))
+        room_number = attrs.get("room_number", getattr(self.instance, "room_number", None))
+        existing = self.context.get("existing_room_numbers")
+        if existing is not None:
+            taken = (hotel.pk, room_number) in existing
+        else:
+            rooms = Room.objects.filter(hotel=hotel, room_number=room_number)
+            if self.instance is not None:
+                rooms = rooms.exclude(pk=self.instance.pk)
+            taken = rooms.exists()
+        if taken:
             raise serializers.ValidationError("This room is already booked")
         return attrs
 
+    @staticmethod
+    def validate_amenities(value):
+        if len({amenity.pk for amenity in value}) != len(value):
+            raise serializers.ValidationError("An amenity is listed more than once")
+        return value
+
     @staticmethod
     def validate_discount_percentage(value):
         if 0 >= value or value >= 100:
@@ -224,6 +339,112 @@ class RoomSerializer(serializers.Serializer):
         return value
 
 
+class RoomSearchSerializer(serializers.Serializer):
+    city = serializers.CharField(required=False)
+    country = serializers.CharField(required=False)
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    guests = serializers.IntegerField(min_value=1, default=1)
+    amenities = serializers.ListField(child=serializers.IntegerField(), required=False, default=list)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+    def validate(self, attrs):
+        if attrs["check_out"] <= attrs["check_in"]:
+            raise serializers.ValidationError("Check-out date must be after check-in date")
+        if not attrs.get("city") and not attrs.get("country"):
+            raise serializers.ValidationError("Either city or country is required")
+        return attrs
+
+
+class TextSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    type = serializers.MultipleChoiceField(choices=SEARCH_KINDS, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=50, default=10)
+
+
+class CalendarRangeSerializer(serializers.Serializer):
+    start = serializers.DateField(input_formats=["%Y-%m"], required=False)
+    months = serializers.IntegerField(min_value=1, max_value=12, default=12)
+
+    def validate(self, attrs):
+        attrs["start"] = (attrs.get("start") or date.today()).replace(day=1)
+        return attrs
+
+
+class AnalyticsRangeSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+
+    def validate(self, attrs):
+        days = (attrs["end"] - attrs["start"]).days
+        if days <= 0:
+            raise serializers.ValidationError("End date must be after start date")
+        if days > 3 * 366:
+            raise serializers.ValidationError("Date range must not exceed three years")
+        return attrs
+
+
+class QuoteStaySerializer(serializers.Serializer):
+    room = serializers.IntegerField()
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+
+    def validate(self, attrs):
+        if attrs["check_out"] <= attrs["check_in"]:
+            raise serializers.ValidationError("Check-out date must be after check-in date")
+        return attrs
+
+
+class QuoteRequestSerializer(serializers.Serializer):
+    MAX_STAYS = 1000
+
+    stays = QuoteStaySerializer(many=True, required=False)
+    check_in = serializers.DateField(required=False)
+    check_out = serializers.DateField(required=False)
+    hotel = serializers.IntegerField(required=False)
+    city = serializers.CharField(required=False)
+    rooms = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, attrs):
+        stays = attrs.get("stays")
+        if stays is not None:
+            if len(stays) > self.MAX_STAYS:
+                raise serializers.ValidationError(f"At most {self.MAX_STAYS} stays can be quoted at once")
+            return attrs
+
+        check_in, check_out = attrs.get("check_in"), attrs.get("check_out")
+        if not check_in or not check_out:
+            raise serializers.ValidationError("Either stays or check_in/check_out are required")
+        if check_out <= check_in:
+            raise serializers.ValidationError("Check-out date must be after check-in date")
+        if not any(attrs.get(key) for key in ("hotel", "city", "rooms")):
+            raise serializers.ValidationError("Filter the rooms by hotel, city or rooms")
+        return attrs
+
+
+class QuoteSerializer(serializers.Serializer):
+    room = serializers.IntegerField()
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+    nights = serializers.IntegerField()
+    subtotal = serializers.DecimalField(max_digits=12, decimal_places=2, allow_null=True)
+    discount_percentage = serializers.IntegerField(allow_null=True)
+    total_price = serializers.DecimalField(max_digits=12, decimal_places=2, allow_null=True)
+
+
+class ExportFilterSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(choices=("ndjson", "csv"), default="ndjson")
+    hotel = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Booking.STATUS_CHOICES, required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get("start") and attrs.get("end") and attrs["end"] <= attrs["start"]:
+            raise serializers.ValidationError("End date must be after start date")
+        return attrs
+
+
 class RoomsBookingsSerializer(serializers.Serializer):
     id = serializers.IntegerField(read_only=True)
     check_in = serializers.DateField()
@@ -281,14 +502,7 @@ class RoomsBookingsSerializer(serializers.Serializer):
         check_out = attrs.get("check_out")
         
         if room and check_in and check_out:
-            overlap = Booking.objects.filter(
-                room=room,
-                status__in=["pending", "confirmed"],
-                check_in__lt=check_out,
-                check_out__gt=check_in
-            ) 
-            
-            if overlap.exists(): 
+            if not is_room_available(room, check_in, check_out):
                 raise serializers.ValidationError("The room is not available for the selected dates")
             
         return attrs
@@ -298,16 +512,11 @@ class RoomsBookingsSerializer(serializers.Serializer):
         room = self.context.get("room")
         user = self.context.get("user")
 
-        nights = (validated_data["check_out"] - validated_data["check_in"]).days
-        discount = Decimal(room.discount_percentage) / Decimal("100")
-        total_price = room.price_per_night * nights * (Decimal("1") - discount)
-
-        booking = Booking.objects.create(
-            user=user,
-            room=room,
-            total_price=total_price,
-            **validated_data
-        )
+        try:
+            booking = reserve_room(room.pk, user, **validated_data)
+        except (RoomUnavailable, RoomBusy) as exc:
+            raise serializers.ValidationError(str(exc))
+        booking.room = room
         return booking
     
 
@@ -325,6 +534,8 @@ class HotelSerializer(serializers.Serializer):
     rooms_count = serializers.SerializerMethodField()
 
     def get_rooms_count(self, obj):
+        if hasattr(obj, "rooms_count"):
+            return obj.rooms_count
         return obj.rooms.count()
 
 
@@ -387,31 +598,19 @@ class RoomDetailSerializer(serializers.Serializer):
     overall_average_rating = serializers.SerializerMethodField()
 
     def get_reviews_count(self, obj):
-        return obj.reviews.count()
+        return obj.reviews_count
 
     def get_average_cleanliness(self, obj):
-        reviews = obj.reviews.all()
-        if not reviews:
-            return 0
-        return round(sum(r.cleanliness_rating for r in reviews) / len(reviews), 2)
+        return obj.rating_average("cleanliness")
 
     def get_average_comfort(self, obj):
-        reviews = obj.reviews.all()
-        if not reviews:
-            return 0
-        return round(sum(r.comfort_rating for r in reviews) / len(reviews), 2)
+        return obj.rating_average("comfort")
 
     def get_average_service(self, obj):
-        reviews = obj.reviews.all()
-        if not reviews:
-            return 0
-        return round(sum(r.service_rating for r in reviews) / len(reviews), 2)
+        return obj.rating_average("service")
 
     def get_overall_average_rating(self, obj):
-        reviews = obj.reviews.all()
-        if not reviews:
-            return 0
-        return round(sum(r.overall_rating for r in reviews) / len(reviews), 2)
+        return obj.rating_average("overall")
 
 
 class ReviewCreateSerializer(serializers.Serializer):
@@ -440,7 +639,12 @@ class ReviewCreateSerializer(serializers.Serializer):
     def create(self, validated_data):
         user = self.context.get("user")
         room = self.context.get("room")
-        review = RoomReview.objects.create(user=user, room=room, **validated_data)
+        try:
+            with transaction.atomic():
+                review = RoomReview.objects.create(user=user, room=room, **validated_data)
+        except IntegrityError:
+            # A concurrent request got past validate() and saved first.
+            raise serializers.ValidationError("You have already left a review for this room")
         return review
     
 
@@ -0,0 +1,126 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from apps.hotel.availability import availability_index
+from apps.hotel.cache import invalidate_hotel_room_details, invalidate_room_details
+from apps.hotel.calendars import invalidate_room_calendars
+from apps.hotel.models import Amenity, Booking, CustomUser, Hotel, Room, RoomReview, RoomType
+from apps.hotel.ratings import RATING_DIMENSIONS, apply_review_delta, review_totals
+
+
+@receiver(pre_save, sender=Booking)
+def booking_pre_save(sender, instance, **kwargs):
+    instance._stored_room_id = None
+    if instance.pk and not kwargs.get("raw"):
+        instance._stored_room_id = Booking.objects.filter(pk=instance.pk).values_list("room_id", flat=True).first()
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance, **kwargs):
+    booking_id, room_id = instance.pk, instance.room_id
+    check_in, check_out, status = instance.check_in, instance.check_out, instance.status
+    transaction.on_commit(
+        lambda: availability_index.booking_saved(booking_id, room_id, check_in, check_out, status)
+    )
+    previous_room_id = getattr(instance, "_stored_room_id", None)
+    invalidate_room_calendars([room_id] + ([previous_room_id] if previous_room_id else []))
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, **kwargs):
+    booking_id = instance.pk
+    transaction.on_commit(lambda: availability_index.booking_deleted(booking_id))
+    invalidate_room_calendars([instance.room_id])
+
+
+@receiver(pre_save, sender=RoomReview)
+def review_pre_save(sender, instance, **kwargs):
+    instance._stored_review = None
+    if instance.pk and not kwargs.get("raw"):
+        instance._stored_review = RoomReview.objects.filter(pk=instance.pk).only(
+            "room_id", *(f"{d}_rating" for d in RATING_DIMENSIONS)
+        ).first()
+
+
+@receiver(post_save, sender=RoomReview)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_stored_review", None)
+    if previous is None:
+        apply_review_delta(instance.room_id, review_totals(instance))
+    elif previous.room_id != instance.room_id:
+        apply_review_delta(previous.room_id, review_totals(previous, sign=-1))
+        apply_review_delta(instance.room_id, review_totals(instance))
+    else:
+        old, new = review_totals(previous), review_totals(instance)
+        apply_review_delta(instance.room_id, {field: new[field] - old[field] for field in new})
+
+
+@receiver(post_delete, sender=RoomReview)
+def review_deleted(sender, instance, **kwargs):
+    apply_review_delta(instance.room_id, review_totals(instance, sign=-1))
+
+
+@receiver(pre_save, sender=Room)
+def room_pre_save(sender, instance, **kwargs):
+    instance._stored_hotel_id = None
+    if instance.pk and not kwargs.get("raw"):
+        instance._stored_hotel_id = Room.objects.filter(pk=instance.pk).values_list("hotel_id", flat=True).first()
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def room_changed(sender, instance, created=False, **kwargs):
+    # Every cached room detail embeds its hotel's rooms_count, so adding, removing or
+    # moving a room stales all of its siblings (in the old hotel too).
+    previous_hotel_id = getattr(instance, "_stored_hotel_id", None)
+    deleted = kwargs.get("signal") is post_delete
+    if created or deleted or previous_hotel_id != instance.hotel_id:
+        invalidate_hotel_room_details([instance.hotel_id, previous_hotel_id])
+    invalidate_room_details([instance.pk])
+
+
+@receiver(post_save, sender=RoomReview)
+@receiver(post_delete, sender=RoomReview)
+def review_changed(sender, instance, **kwargs):
+    previous = getattr(instance, "_stored_review", None)
+    invalidate_room_details([instance.room_id] + ([previous.room_id] if previous else []))
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_delete, sender=Hotel)
+def hotel_changed(sender, instance, **kwargs):
+    invalidate_hotel_room_details([instance.pk])
+
+
+@receiver(post_save, sender=RoomType)
+@receiver(post_delete, sender=RoomType)
+def room_type_changed(sender, instance, **kwargs):
+    invalidate_room_details(Room.objects.filter(room_type_id=instance.pk).values_list("id", flat=True))
+
+
+@receiver(post_save, sender=Amenity)
+@receiver(pre_delete, sender=Amenity)
+def amenity_changed(sender, instance, **kwargs):
+    invalidate_room_details(instance.rooms.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=CustomUser)
+def reviewer_changed(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    invalidate_room_details(RoomReview.objects.filter(user_id=instance.pk).values_list("room_id", flat=True))
+
+
+@receiver(m2m_changed, sender=Room.amenities.through)
+def room_amenities_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        invalidate_room_details([instance.pk])
+    elif action == "pre_clear":
+        invalidate_room_details(instance.rooms.values_list("id", flat=True))
+    else:
+        invalidate_room_details(pk_set or ())
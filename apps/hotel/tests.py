@@ -1,3 +1,911 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import tempfile
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ValidationError
+
+from apps.blogs.models import BlogProfile, Comment
+from apps.hotel.availability import availability_index, is_room_available
+from apps.hotel.cache import clear_room_details, get_room_detail
+from apps.hotel.calendars import CALENDAR_CACHE, clear_room_calendars
+from apps.hotel.exports import BOOKING_COLUMNS, REVIEW_COLUMNS
+from apps.hotel.models import Amenity, Booking, CustomUser, Hotel, Room, RoomRateOverride, RoomReview, RoomType
+from apps.hotel.pricing import quote_stay, quote_stays
+from apps.hotel.reservations import RoomBusy, RoomUnavailable, reserve_room
+from apps.hotel.search import search
+from apps.hotel.serializer import HotelNestedSerializer, QuoteRequestSerializer, ReviewCreateSerializer, \
+    RoomDetailSerializer, RoomSerializer
+from core.fast_serializers import fast_serializer
+from core.large_tables import EstimatedCountPaginator, IndexSeekQuerySet
+from core.query_budget import budget_for, query_budget
+from core.settings import REDIS_CACHE_TIMEOUT, shared_cache
+
+
+class FastSerializerParityTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hotel = Hotel.objects.create(
+            name="Parity Hotel", description="d", address="a", city="Samarkand", country="Uzbekistan",
+            star_rating=5, phone="+998901234567", email="parity@example.com",
+        )
+        room_type = RoomType.objects.create(name="Suite", description="d")
+        amenities = [Amenity.objects.create(name=name, icon=name[:2]) for name in ("wifi", "balcony")]
+        users = [
+            CustomUser.objects.create(username=f"guest{i}", phone_number="+998901234567") for i in range(3)
+        ]
+        for i in range(4):
+            room = Room.objects.create(
+                hotel=hotel, room_number=str(200 + i), room_type=room_type, price_per_night=Decimal("120.50"),
+                discount_percentage=15 * (i % 2), capacity=2, floor=2, status="available", description="d",
+            )
+            room.amenities.set(amenities[: i % 3])
+            for user in users[:i]:
+                RoomReview.objects.create(
+                    room=room, user=user, cleanliness_rating=5, comfort_rating=4, service_rating=3,
+                    overall_rating=4, comment="Lovely view from the balcony",
+                )
+
+    def test_room_serializers_match_drf(self):
+        rooms = list(Room.objects.order_by("id"))
+        for serializer_class in (RoomSerializer, RoomDetailSerializer):
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertEqual(
+                    fast_serializer(serializer_class).many(rooms),
+                    serializer_class(rooms, many=True).data,
+                )
+
+    def test_values_rows_match_drf(self):
+        rows = list(Hotel.objects.values("id", "name", "city", "star_rating"))
+        self.assertEqual(
+            fast_serializer(HotelNestedSerializer).many(rows),
+            HotelNestedSerializer(rows, many=True).data,
+        )
+
+    async def test_async_views_match_sync_views(self):
+        room_ids = [pk async for pk in Room.objects.order_by("id").values_list("id", flat=True)]
+        paths = [("/hotel/rooms/?page_size=3", "/hotel/async/rooms/?page_size=3")]
+        for pk in room_ids:
+            paths += [
+                (f"/hotel/rooms/{pk}/", f"/hotel/async/rooms/{pk}/"),
+                (f"/hotel/rooms-detail/{pk}/", f"/hotel/async/rooms-detail/{pk}/"),
+            ]
+        for sync_path, async_path in paths:
+            with self.subTest(path=async_path):
+                clear_room_details()
+                expected = (await self.async_client.get(sync_path)).json()
+                clear_room_details()
+                actual = (await self.async_client.get(async_path)).json()
+                if "results" in expected:
+                    expected, actual = expected["results"], actual["results"]
+                self.assertEqual(actual, expected)
+
+
+class AvailabilityIndexTest(TestCase):
+    def setUp(self):
+        availability_index.invalidate()
+        self.addCleanup(availability_index.invalidate)
+        self.user = CustomUser.objects.create(username="index", phone_number="+998901234567")
+        hotel = Hotel.objects.create(
+            name="Index Hotel", description="d", address="a", city="Andijan", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="index@example.com",
+        )
+        room_type = RoomType.objects.create(name="Single", description="d")
+        self.rooms = [
+            Room.objects.create(
+                hotel=hotel, room_number=str(i), room_type=room_type, price_per_night=Decimal("40.00"),
+                capacity=1, floor=1, description="d",
+            )
+            for i in range(3)
+        ]
+        self.nights = (date(2030, 5, 1), date(2030, 5, 3))
+
+    def book(self, room):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(
+                room=room, user=self.user, check_in=self.nights[0], check_out=self.nights[1], guests_count=1,
+                total_price=Decimal("80.00"), status="confirmed",
+            )
+
+    def test_stale_busy_verdict_is_confirmed_with_the_database(self):
+        booking = self.book(self.rooms[0])
+        self.assertFalse(is_room_available(self.rooms[0], *self.nights))
+        # Cancelled behind the index's back, as another worker or a bulk update would.
+        Booking.objects.filter(pk=booking.pk).update(status="cancelled")
+        with self.assertNumQueries(1):
+            self.assertTrue(is_room_available(self.rooms[0], *self.nights))
+        with self.assertNumQueries(0):
+            self.assertTrue(is_room_available(self.rooms[0], *self.nights))
+
+    def test_cancellation_frees_the_dates_without_a_query(self):
+        booking = self.book(self.rooms[0])
+        self.assertFalse(is_room_available(self.rooms[0], *self.nights))
+        booking.status = "cancelled"
+        with self.captureOnCommitCallbacks(execute=True):
+            booking.save()
+        with self.assertNumQueries(0):
+            self.assertTrue(is_room_available(self.rooms[0], *self.nights))
+
+    @override_settings(HOTEL_AVAILABILITY_INDEX_SIZE=2)
+    def test_rooms_are_tracked_separately_and_evicted(self):
+        self.book(self.rooms[0])
+        self.assertEqual(
+            [is_room_available(room, *self.nights) for room in self.rooms], [False, True, True],
+        )
+        self.assertEqual(list(availability_index._rooms), [self.rooms[1].pk, self.rooms[2].pk])
+        self.assertFalse(is_room_available(self.rooms[0], *self.nights))
+        self.assertNotIn(self.rooms[1].pk, availability_index._rooms)
+
+
+class RoomBulkCreateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(
+            name="Bulk Hotel", description="d", address="a", city="Fergana", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="bulk@example.com",
+        )
+        cls.room_type = RoomType.objects.create(name="Double", description="d")
+        cls.amenities = [Amenity.objects.create(name=f"amenity {i}", icon="i") for i in range(3)]
+
+    def payload(self, count, start=0, **overrides):
+        return [
+            {
+                "hotel": self.hotel.pk, "room_number": str(start + i), "room_type": self.room_type.pk,
+                "amenities": [amenity.pk for amenity in self.amenities[: i % 4]], "price_per_night": "60.00",
+                "discount_percentage": 10, "capacity": 2, "floor": 1, "status": "available", "description": "d",
+                **overrides,
+            }
+            for i in range(count)
+        ]
+
+    def post(self, rooms):
+        return self.client.post("/hotel/rooms/", rooms, content_type="application/json")
+
+    @staticmethod
+    def lookups(queries):
+        # INSERTs are split by SQLite's bound-parameter limit, not per room.
+        return [query["sql"] for query in queries if not query["sql"].startswith("INSERT")]
+
+    def test_query_count_does_not_grow_with_the_batch(self):
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.post(self.payload(10)).status_code, 201)
+        with CaptureQueriesContext(connection) as large:
+            response = self.post(self.payload(100, start=100))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.lookups(large)), len(self.lookups(small)))
+        self.assertLessEqual(len(large) - len(self.lookups(large)), 3)
+        self.assertEqual(len(response.json()), 100)
+        self.assertEqual(Room.objects.count(), 110)
+        self.assertEqual(Room.amenities.through.objects.count(), sum(i % 4 for i in [*range(10), *range(100)]))
+
+    def test_bad_related_ids_are_rejected(self):
+        for field, value in (
+            ("hotel", 999999),
+            ("room_type", True),
+            ("amenities", [True]),
+            ("amenities", [999999]),
+            ("amenities", [self.amenities[0].pk, self.amenities[0].pk]),
+        ):
+            with self.subTest(field=field, value=value):
+                response = self.post(self.payload(2, **{field: value}))
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(field, response.json()["0"])
+        self.assertFalse(Room.objects.exists())
+
+    def test_duplicate_room_numbers_are_rejected(self):
+        response = self.post(self.payload(2, room_number="7"))
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Room.objects.exists())
+
+
+class ReservationStressTest(TransactionTestCase):
+    threads = 8
+    attempts_per_thread = 25
+
+    def setUp(self):
+        self.user = CustomUser.objects.create(username="stress", phone_number="+998901234567")
+        hotel = Hotel.objects.create(
+            name="Stress Hotel", description="d", address="a", city="Tashkent", country="Uzbekistan",
+            star_rating=4, phone="+998901234567", email="stress@example.com",
+        )
+        room_type = RoomType.objects.create(name="Standard", description="d")
+        self.rooms = [
+            Room.objects.create(
+                hotel=hotel, room_number=str(100 + i), room_type=room_type, price_per_night=Decimal("80.00"),
+                capacity=2, floor=1, description="d",
+            )
+            for i in range(4)
+        ]
+
+    def _hammer(self, room_ids, outcomes):
+        start = date(2030, 1, 1)
+
+        def worker(seed):
+            try:
+                for i in range(self.attempts_per_thread):
+                    check_in = start + timedelta(days=(seed * 7 + i * 3) % 40)
+                    room_id = room_ids[(seed + i) % len(room_ids)]
+                    try:
+                        reserve_room(room_id, self.user, check_in, check_in + timedelta(days=3), attempts=50, guests_count=1)
+                        outcomes.append("booked")
+                    except (RoomUnavailable, RoomBusy) as exc:
+                        outcomes.append(type(exc).__name__)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker, args=(n,)) for n in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    def assertNoDoubleBooking(self):
+        for room in self.rooms:
+            intervals = sorted(
+                Booking.objects.filter(room=room, status__in=["pending", "confirmed"]).values_list("check_in", "check_out")
+            )
+            for (_, previous_out), (next_in, _) in zip(intervals, intervals[1:]):
+                self.assertLessEqual(previous_out, next_in, f"room {room.pk} is double-booked")
+
+    def test_concurrent_reservations_never_overlap(self):
+        outcomes = []
+        self._hammer([room.pk for room in self.rooms], outcomes)
+
+        self.assertNoDoubleBooking()
+        booked = outcomes.count("booked")
+        self.assertEqual(booked, Booking.objects.count())
+        self.assertGreater(booked, 0)
+
+    def test_same_dates_same_room_books_once(self):
+        outcomes = []
+        barrier = threading.Barrier(self.threads)
+
+        def worker():
+            try:
+                barrier.wait()
+                reserve_room(self.rooms[0].pk, self.user, date(2030, 6, 1), date(2030, 6, 4), attempts=50, guests_count=1)
+                outcomes.append("booked")
+            except RoomUnavailable:
+                outcomes.append("unavailable")
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=worker) for _ in range(self.threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        self.assertEqual(outcomes.count("booked"), 1)
+        self.assertEqual(Booking.objects.filter(room=self.rooms[0]).count(), 1)
+
+
+class RoomDetailCacheTest(TestCase):
+    def setUp(self):
+        clear_room_details()
+        self.hotel = Hotel.objects.create(
+            name="Cache Hotel", description="d", address="a", city="Bukhara", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="cache@example.com",
+        )
+        self.room = Room.objects.create(
+            hotel=self.hotel, room_number="1", room_type=RoomType.objects.create(name="Twin", description="d"),
+            price_per_night=Decimal("50.00"), capacity=2, floor=1, description="d",
+        )
+        self.url = f"/hotel/rooms-detail/{self.room.pk}/"
+
+    def test_etag_revalidation_returns_304_without_queries(self):
+        etag = self.client.get(self.url).headers["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_related_writes_invalidate_cached_payload(self):
+        etag = self.client.get(self.url).headers["ETag"]
+        self.hotel.name = "Renamed Hotel"
+        self.hotel.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["hotel"]["name"], "Renamed Hotel")
+
+        self.room.amenities.add(Amenity.objects.create(name="sauna", icon="s"))
+        self.assertEqual([a["name"] for a in self.client.get(self.url).json()["amenities"]], ["sauna"])
+
+    def test_sibling_rooms_see_new_rooms_count(self):
+        self.assertEqual(self.client.get(self.url).json()["hotel"]["rooms_count"], 1)
+        other = Hotel.objects.create(
+            name="Other", description="d", address="a", city="Khiva", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="other@example.com",
+        )
+        sibling = Room.objects.create(
+            hotel=other, room_number="2", room_type=self.room.room_type, price_per_night=Decimal("50.00"),
+            capacity=2, floor=1, description="d",
+        )
+        sibling.hotel = self.hotel
+        sibling.save()
+        self.assertEqual(self.client.get(self.url).json()["hotel"]["rooms_count"], 2)
+        sibling.delete()
+        self.assertEqual(self.client.get(self.url).json()["hotel"]["rooms_count"], 1)
+
+    def test_clearing_room_details_keeps_calendars(self):
+        caches[CALENDAR_CACHE].set("probe", 1)
+        self.addCleanup(caches[CALENDAR_CACHE].delete, "probe")
+        self.client.get(self.url)
+        clear_room_details()
+        self.assertIsNone(get_room_detail(self.room.pk))
+        self.assertEqual(caches[CALENDAR_CACHE].get("probe"), 1)
+
+    def test_redis_caches_get_their_own_database_and_a_ttl(self):
+        with mock.patch("core.settings.REDIS_URL", "redis://cache:6379/0"):
+            config = shared_cache("room-detail", 5000, redis_db=3)
+        self.assertEqual(config["LOCATION"], "redis://cache:6379/3")
+        self.assertEqual((config["KEY_PREFIX"], config["TIMEOUT"]), ("room-detail", REDIS_CACHE_TIMEOUT))
+
+
+class HotelQueryBudgetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hotel = Hotel.objects.create(
+            name="Budget Hotel", description="d", address="a", city="Khiva", country="Uzbekistan",
+            star_rating=4, phone="+998901234567", email="budget@example.com",
+        )
+        cls.room = Room.objects.create(
+            hotel=hotel, room_number="7", room_type=RoomType.objects.create(name="Double", description="d"),
+            price_per_night=Decimal("70.00"), capacity=2, floor=1, description="d",
+        )
+        cls.room.amenities.set([Amenity.objects.create(name=f"amenity {i}", icon="i") for i in range(5)])
+        for i in range(5):
+            user = CustomUser.objects.create(username=f"budget{i}", phone_number="+998901234567")
+            RoomReview.objects.create(
+                room=cls.room, user=user, cleanliness_rating=4, comfort_rating=4, service_rating=4,
+                overall_rating=4, comment="Quiet and clean room",
+            )
+
+    def test_room_detail_view_within_budget(self):
+        clear_room_details()
+        with query_budget(budget_for("apps.hotel.views.room_detail_view")):
+            self.assertEqual(self.client.get(f"/hotel/rooms-detail/{self.room.pk}/").status_code, 200)
+
+    def test_rooms_id_view_within_budget(self):
+        with query_budget(budget_for("apps.hotel.views.rooms_id_view")):
+            self.assertEqual(self.client.get(f"/hotel/rooms/{self.room.pk}/").status_code, 200)
+
+    @override_settings(DEBUG=True)
+    async def test_queries_are_counted_under_asgi(self):
+        response = await self.async_client.get(f"/hotel/rooms/{self.room.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+
+
+class TextSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.hotel = Hotel.objects.create(
+            name="Search Hotel", description="Seaside resort with balconies", address="a", city="Khiva",
+            country="Uzbekistan", star_rating=4, phone="+998901234567", email="search@example.com",
+        )
+        cls.room = Room.objects.create(
+            hotel=cls.hotel, room_number="7", room_type=RoomType.objects.create(name="Double", description="d"),
+            price_per_night=Decimal("80.00"), capacity=2, floor=1, description="Quiet room facing the garden",
+        )
+
+    def test_ranked_results_with_snippets(self):
+        response = self.client.get("/hotel/search/", {"q": "balcony Khiva"})
+        self.assertEqual(response.status_code, 200)
+        [hotel] = response.json()["hotels"]
+        self.assertEqual(hotel["id"], self.hotel.pk)
+        self.assertIn("<mark>balconies</mark>", hotel["snippet"])
+
+    def test_snippets_escape_stored_text(self):
+        self.hotel.description = 'Seaside <img src=x onerror="alert(1)"> balconies'
+        self.hotel.save()
+        [hotel] = search("balconies")["hotels"]
+        self.assertNotIn("<img", hotel["snippet"])
+        self.assertIn("&lt;img", hotel["snippet"])
+        self.assertIn("<mark>balconies</mark>", hotel["snippet"])
+
+    def test_index_follows_writes(self):
+        self.assertEqual([row["id"] for row in search("garden")["rooms"]], [self.room.pk])
+        Room.objects.filter(pk=self.room.pk).update(description="Overlooks the courtyard")
+        self.assertEqual(search("garden")["rooms"], [])
+        self.assertEqual(len(search("courtyard")["rooms"]), 1)
+        self.room.delete()
+        self.assertEqual(search("courtyard")["rooms"], [])
+
+
+class RoomSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        guest = CustomUser.objects.create(username="searcher")
+        hotel = Hotel.objects.create(
+            name="Search Hotel", description="d", address="a", city="Bukhara", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="search@example.com",
+        )
+        elsewhere = Hotel.objects.create(
+            name="Other Hotel", description="d", address="a", city="Khiva", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="other@example.com",
+        )
+        room_type = RoomType.objects.create(name="Double", description="d")
+        cls.pool, cls.wifi = Amenity.objects.create(name="Pool", icon="p"), Amenity.objects.create(name="Wifi", icon="w")
+
+        def room(number, price, discount=0, capacity=2, status="available", on=hotel, amenities=()):
+            created = Room.objects.create(
+                hotel=on, room_number=number, room_type=room_type, price_per_night=Decimal(price),
+                discount_percentage=discount, capacity=capacity, floor=1, description="d", status=status,
+            )
+            created.amenities.set(amenities)
+            return created
+
+        cls.pricey = room("1", "200.00", amenities=[cls.pool, cls.wifi])
+        # 120 less 25% is 90, so it sorts before the 100 room despite the higher base price.
+        cls.discounted = room("2", "120.00", discount=25, amenities=[cls.wifi])
+        cls.cheap = room("3", "100.00", capacity=4, amenities=[cls.pool, cls.wifi])
+        room("4", "50.00", capacity=1)
+        room("5", "60.00", status="maintenance")
+        room("6", "70.00", on=elsewhere)
+        booked = room("7", "80.00")
+        Booking.objects.create(
+            room=booked, user=guest, check_in=date(2030, 5, 2), check_out=date(2030, 5, 4), guests_count=1,
+            total_price=Decimal("160.00"), status="confirmed",
+        )
+        Booking.objects.create(
+            room=cls.cheap, user=guest, check_in=date(2030, 5, 2), check_out=date(2030, 5, 4), guests_count=1,
+            total_price=Decimal("200.00"), status="cancelled",
+        )
+
+    def search(self, **params):
+        response = self.client.get("/hotel/rooms/search/", {
+            "city": "bukhara", "check_in": "2030-05-01", "check_out": "2030-05-03", **params,
+        })
+        self.assertEqual(response.status_code, 200)
+        return [room["id"] for room in response.json()]
+
+    def test_free_rooms_are_ordered_by_final_price(self):
+        self.assertEqual(self.search(guests=2), [self.discounted.pk, self.cheap.pk, self.pricey.pk])
+        self.assertEqual(self.search(guests=3), [self.cheap.pk])
+        self.assertEqual(self.search(guests=2, limit=1), [self.discounted.pk])
+
+    def test_rooms_must_have_every_requested_amenity(self):
+        self.assertEqual(self.search(amenities=[self.pool.pk]), [self.cheap.pk, self.pricey.pk])
+        self.assertEqual(self.search(amenities=[self.pool.pk, self.wifi.pk], guests=3), [self.cheap.pk])
+
+    def test_invalid_searches_are_rejected(self):
+        for params in (
+            {"check_in": "2030-05-01", "check_out": "2030-05-03"},
+            {"city": "Bukhara", "check_in": "2030-05-03", "check_out": "2030-05-01"},
+        ):
+            self.assertEqual(self.client.get("/hotel/rooms/search/", params).status_code, 400)
+
+
+class ExportPermissionTest(TestCase):
+    def test_exports_are_staff_only(self):
+        for url in ("/hotel/exports/bookings/", "/hotel/exports/reviews/"):
+            self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(CustomUser.objects.create(username="guest"))
+        self.assertEqual(self.client.get("/hotel/exports/bookings/").status_code, 403)
+        self.client.force_login(CustomUser.objects.create(username="staff", is_staff=True))
+        for url in ("/hotel/exports/bookings/", "/hotel/exports/reviews/"):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class ExportContentTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = CustomUser.objects.create(username="exporter", is_staff=True)
+        hotel = Hotel.objects.create(
+            name="Export Hotel", description="d", address="a", city="Fergana", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="export@example.com",
+        )
+        cls.room = Room.objects.create(
+            hotel=hotel, room_number="12", room_type=RoomType.objects.create(name="Single", description="d"),
+            price_per_night=Decimal("80.00"), capacity=1, floor=1, description="d",
+        )
+        cls.bookings = [
+            Booking.objects.create(
+                room=cls.room, user=cls.staff, check_in=date(2030, 2, day), check_out=date(2030, 2, day + 1),
+                guests_count=1, total_price=Decimal(total), status=status,
+            )
+            for day, total, status in ((1, "80.10", "confirmed"), (3, "80.00", "cancelled"))
+        ]
+        RoomReview.objects.create(
+            room=cls.room, user=cls.staff, cleanliness_rating=5, comfort_rating=4, service_rating=3,
+            overall_rating=4, comment="Quiet, with a view",
+        )
+
+    def export(self, url, **params):
+        self.client.force_login(self.staff)
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_bookings_csv_has_a_header_and_one_row_per_booking(self):
+        response, body = self.export("/hotel/exports/bookings/", output="csv")
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="bookings.csv"', response["Content-Disposition"])
+        header, *rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(header, [name for name, _ in BOOKING_COLUMNS])
+        self.assertEqual([row[:5] for row in rows], [
+            [str(booking.pk), str(self.room.pk), "12", str(self.room.hotel_id), "Export Hotel"] for booking in self.bookings
+        ])
+        self.assertEqual([(row[10], row[11]) for row in rows], [("80.10", "confirmed"), ("80.00", "cancelled")])
+
+    def test_ndjson_keeps_decimals_as_strings_and_applies_filters(self):
+        response, body = self.export("/hotel/exports/bookings/", status="confirmed")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        [row] = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(list(row), [name for name, _ in BOOKING_COLUMNS])
+        self.assertEqual(
+            (row["id"], row["username"], row["check_in"], row["total_price"]),
+            (self.bookings[0].pk, "exporter", "2030-02-01", "80.10"),
+        )
+
+    def test_reviews_ndjson(self):
+        _, body = self.export("/hotel/exports/reviews/")
+        [row] = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(list(row), [name for name, _ in REVIEW_COLUMNS])
+        self.assertEqual((row["room_number"], row["overall_rating"], row["comment"]), ("12", 4, "Quiet, with a view"))
+
+
+class HotelAnalyticsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = CustomUser.objects.create(username="analyst", is_staff=True)
+        cls.guest = CustomUser.objects.create(username="guest")
+        cls.hotel = Hotel.objects.create(
+            name="Metrics Hotel", description="d", address="a", city="Termez", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="metrics@example.com",
+        )
+        room_type = RoomType.objects.create(name="Double", description="d")
+        rooms = [
+            Room.objects.create(
+                hotel=cls.hotel, room_number=str(i), room_type=room_type, price_per_night=Decimal("100.00"),
+                capacity=2, floor=1, description="d",
+            )
+            for i in range(2)
+        ]
+        for room, check_in, check_out, total, status in (
+            (rooms[0], date(2030, 1, 1), date(2030, 1, 3), "200.00", "confirmed"),
+            (rooms[1], date(2030, 1, 2), date(2030, 1, 6), "400.00", "completed"),
+            (rooms[0], date(2030, 1, 3), date(2030, 1, 4), "900.00", "cancelled"),
+        ):
+            Booking.objects.create(
+                room=room, user=cls.guest, check_in=check_in, check_out=check_out, guests_count=1,
+                total_price=Decimal(total), status=status,
+            )
+        cls.url = f"/hotel/hotels/{cls.hotel.pk}/analytics/"
+        cls.params = {"start": "2030-01-01", "end": "2030-01-05"}
+
+    def test_analytics_are_staff_only(self):
+        self.assertEqual(self.client.get(self.url, self.params).status_code, 403)
+        self.client.force_login(self.guest)
+        self.assertEqual(self.client.get(self.url, self.params).status_code, 403)
+
+    def test_occupancy_and_revenue_per_night(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, self.params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["summary"], {
+            "room_nights_available": 8, "room_nights_sold": 5, "revenue": 500.0,
+            "occupancy": 0.625, "adr": 100.0, "revpar": 62.5,
+        })
+        self.assertEqual([(day["occupied"], day["revenue"]) for day in data["days"]], [
+            (1, 100.0), (2, 200.0), (1, 100.0), (1, 100.0),
+        ])
+
+
+class QuotePricingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hotel = Hotel.objects.create(
+            name="Quote Hotel", description="d", address="a", city="Nukus", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="quotes@example.com",
+        )
+        room_type = RoomType.objects.create(name="Double", description="d")
+        cls.rooms = [
+            Room.objects.create(
+                hotel=hotel, room_number=str(i), room_type=room_type, price_per_night=Decimal("100.00"),
+                discount_percentage=15, capacity=2, floor=1, description="d",
+            )
+            for i in range(2)
+        ]
+        RoomRateOverride.objects.create(room=cls.rooms[0], date=date(2030, 3, 2), price_per_night=Decimal("300.00"))
+        cls.hotel = hotel
+
+    def test_override_night_and_discount(self):
+        [quote] = quote_stays([(self.rooms[0].pk, date(2030, 3, 1), date(2030, 3, 3))])
+        self.assertEqual(quote["nights"], 2)
+        self.assertEqual(quote["subtotal"], Decimal("400.00"))
+        self.assertEqual(quote["total_price"], Decimal("340.00"))
+        self.assertEqual(quote_stay(self.rooms[0], date(2030, 3, 1), date(2030, 3, 3)), Decimal("340.00"))
+
+    def test_overrides_outside_the_stay_are_ignored(self):
+        first, second, unknown = quote_stays([
+            (self.rooms[0].pk, date(2030, 3, 3), date(2030, 3, 5)),
+            (self.rooms[1].pk, date(2030, 3, 1), date(2030, 3, 3)),
+            (0, date(2030, 3, 1), date(2030, 3, 3)),
+        ])
+        self.assertEqual((first["subtotal"], first["total_price"]), (Decimal("200.00"), Decimal("170.00")))
+        self.assertEqual((second["subtotal"], second["total_price"]), (Decimal("200.00"), Decimal("170.00")))
+        self.assertIsNone(unknown["total_price"])
+
+    def test_quotes_view_filters_by_hotel(self):
+        response = self.client.post("/hotel/quotes/", {
+            "hotel": self.hotel.pk, "check_in": "2030-03-01", "check_out": "2030-03-03",
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(q["room"], q["subtotal"], q["total_price"]) for q in response.json()], [
+            (self.rooms[0].pk, "400.00", "340.00"),
+            (self.rooms[1].pk, "200.00", "170.00"),
+        ])
+
+    def test_quotes_view_rejects_filters_matching_too_many_rooms(self):
+        with mock.patch.object(QuoteRequestSerializer, "MAX_STAYS", 1):
+            response = self.client.post("/hotel/quotes/", {
+                "hotel": self.hotel.pk, "check_in": "2030-03-01", "check_out": "2030-03-03",
+            }, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.json())
+
+
+class ReviewCreateTest(TestCase):
+    def test_losing_a_duplicate_review_race_is_a_validation_error(self):
+        hotel = Hotel.objects.create(
+            name="Race Hotel", description="d", address="a", city="c", country="UZ", star_rating=3,
+            phone="+998", email="race@example.com",
+        )
+        room = Room.objects.create(
+            hotel=hotel, room_number="1", room_type=RoomType.objects.create(name="Single", description="d"),
+            price_per_night=Decimal("50.00"), capacity=1, floor=1, description="d",
+        )
+        user = CustomUser.objects.create(username="reviewer")
+        ratings = {f"{d}_rating": 4 for d in ("cleanliness", "comfort", "service", "overall")}
+        serializer = ReviewCreateSerializer(data={**ratings, "comment": "Clean and quiet"}, context={"user": user, "room": room})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        RoomReview.objects.create(room=room, user=user, comment="Got here first", **ratings)
+        with self.assertRaises(ValidationError):
+            serializer.save()
+        room.refresh_from_db()
+        self.assertEqual(room.reviews_count, 1)
+
+
+class UserImportTest(TestCase):
+    def test_registration_hashes_and_writes_once(self):
+        payload = {
+            "username": "single_hash", "email": "single@example.com", "password": "Secret123!",
+            "password_confirm": "Secret123!", "first_name": "A", "last_name": "B", "phone_number": "+998901234567",
+        }
+        with self.assertNumQueries(1):
+            response = self.client.post("/hotel/register/", payload)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(CustomUser.objects.get(username="single_hash").check_password("Secret123!"))
+
+    def test_import_users_creates_users_and_profiles(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as handle:
+            handle.write(json.dumps({"username": "imported", "password": "Secret123!", "bio": "Travel writer"}) + "\n")
+            handle.write(json.dumps({"username": "imported"}) + "\n")
+            handle.write(json.dumps({"username": "no password"}) + "\n")
+        self.addCleanup(os.remove, handle.name)
+        call_command("import_users", handle.name, "--workers=1", stdout=io.StringIO(), stderr=io.StringIO())
+
+        user = CustomUser.objects.get(username="imported")
+        self.assertTrue(user.check_password("Secret123!"))
+        self.assertEqual(BlogProfile.objects.get(user=user).bio, "Travel writer")
+        self.assertEqual(CustomUser.objects.count(), 1)
+
+
+class ImportBookingsTest(TestCase):
+    def setUp(self):
+        availability_index.invalidate()
+        self.addCleanup(availability_index.invalidate)
+        self.user = CustomUser.objects.create(username="importer", phone_number="+998901234567")
+        hotel = Hotel.objects.create(
+            name="Import Hotel", description="d", address="a", city="Navoi", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="import@example.com",
+        )
+        room_type = RoomType.objects.create(name="Single", description="d")
+        self.room, self.other = [
+            Room.objects.create(
+                hotel=hotel, room_number=str(i), room_type=room_type, price_per_night=Decimal("40.00"),
+                capacity=2, floor=1, description="d",
+            )
+            for i in range(2)
+        ]
+        Booking.objects.create(
+            room=self.room, user=self.user, check_in=date(2030, 3, 10), check_out=date(2030, 3, 12),
+            guests_count=1, total_price=Decimal("80.00"), status="confirmed",
+        )
+
+    def row(self, check_in, check_out, room=None, user=None, **extra):
+        return json.dumps({
+            "room": room or self.room.pk, "user": user or self.user.pk, "check_in": check_in,
+            "check_out": check_out, "guests_count": 1, **extra,
+        })
+
+    def run_import(self, lines, *args):
+        with tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False) as handle:
+            handle.write("\n".join(lines) + "\n")
+        self.addCleanup(os.remove, handle.name)
+        rejects = handle.name + ".rejects"
+        self.addCleanup(lambda: os.path.exists(rejects) and os.remove(rejects))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_bookings", handle.name, f"--rejects={rejects}", *args, stdout=io.StringIO())
+        with open(rejects, encoding="utf-8") as result:
+            return {item["line"]: item["reason"] for item in map(json.loads, result)}
+
+    def test_rows_are_checked_against_the_file_and_the_database(self):
+        rejected = self.run_import([
+            self.row("2030-03-01", "2030-03-03"),
+            self.row("2030-03-02", "2030-03-04"),
+            self.row("2030-03-11", "2030-03-13"),
+            self.row("2030-03-01", "2030-03-03", room=999999),
+            self.row("2030-03-20", "2030-03-21", user=999999),
+            "{not json",
+            self.row("2030-03-05", "2030-03-04"),
+            json.dumps({"room": self.room.pk, "user": self.user.pk, "check_in": "2030-03-05"}),
+            self.row("2030-03-01", "2030-03-03", status="cancelled"),
+            self.row("2030-03-01", "2030-03-03", room=self.other.pk, total_price="99.50"),
+        ])
+        self.assertEqual(rejected[2], "overlaps another row in the file")
+        self.assertEqual(rejected[3], "overlaps an existing booking")
+        self.assertEqual(rejected[4], "room 999999 does not exist")
+        self.assertEqual(rejected[5], "user 999999 does not exist")
+        self.assertEqual(sorted(rejected), [2, 3, 4, 5, 6, 7, 8])
+        for line in (6, 7, 8):
+            self.assertTrue(rejected[line].startswith("invalid row"), rejected[line])
+        self.assertEqual(
+            sorted(Booking.objects.filter(check_in=date(2030, 3, 1)).values_list("room_id", "status", "total_price")),
+            sorted([
+                (self.room.pk, "pending", Decimal("80.00")),
+                (self.room.pk, "cancelled", Decimal("80.00")),
+                (self.other.pk, "pending", Decimal("99.50")),
+            ]),
+        )
+
+    def test_batches_see_earlier_batches_and_bump_room_versions(self):
+        self.assertTrue(is_room_available(self.room, date(2030, 4, 1), date(2030, 4, 3)))
+        lines = [self.row("2030-04-01", "2030-04-03"), self.row("2030-04-02", "2030-04-05")]
+        self.assertEqual(self.run_import(lines, "--batch-size=1", "--dry-run"), {2: "overlaps an existing booking"})
+        self.assertEqual(Booking.objects.count(), 1)
+
+        self.assertEqual(self.run_import(lines, "--batch-size=1"), {2: "overlaps an existing booking"})
+        self.room.refresh_from_db()
+        self.assertEqual(self.room.booking_version, 1)
+        self.assertNotIn(self.room.pk, availability_index._rooms)
+        self.assertFalse(is_room_available(self.room, date(2030, 4, 1), date(2030, 4, 3)))
+
+
+class SeedCommandTest(TestCase):
+    options = {
+        "users": 12, "hotels": 3, "rooms_per_hotel": 4, "bookings_per_room": 5, "reviews_per_room": 3,
+        "posts": 6, "comments_per_post": 4, "likes_per_post": 3, "bookmark_lists": 2, "batch_size": 7,
+    }
+
+    def seed(self, **options):
+        call_command("seed", **self.options, **options, stdout=io.StringIO())
+
+    def test_seeds_the_requested_volume_consistently(self):
+        self.seed()
+        self.assertEqual(CustomUser.objects.count(), 12)
+        self.assertEqual(BlogProfile.objects.count(), 12)
+        self.assertEqual(Room.objects.count(), 12)
+        self.assertEqual(Booking.objects.count(), 60)
+        self.assertEqual(RoomReview.objects.count(), 36)
+        self.assertEqual(Comment.objects.count(), 24)
+        self.assertFalse(Comment.objects.filter(path="").exists())
+        for room in Room.objects.prefetch_related("reviews", "bookings"):
+            reviews = list(room.reviews.all())
+            self.assertEqual(room.reviews_count, len(reviews))
+            self.assertEqual(room.overall_rating_sum, sum(review.overall_rating for review in reviews))
+            stays = sorted((booking.check_in, booking.check_out) for booking in room.bookings.all())
+            for (_, previous_out), (next_in, _) in zip(stays, stays[1:]):
+                self.assertLessEqual(previous_out, next_in)
+
+    def test_same_seed_gives_the_same_data(self):
+        def snapshot(tag):
+            return list(Booking.objects.filter(user__username__startswith=f"{tag}-").order_by("id").values_list(
+                "room__room_number", "check_in", "check_out", "total_price", "status",
+            ))
+
+        self.seed(seed=7, tag="a")
+        self.seed(seed=7, tag="b")
+        self.seed(seed=8, tag="c")
+        self.assertEqual(snapshot("a"), snapshot("b"))
+        self.assertNotEqual(snapshot("a"), snapshot("c"))
+
+
+class AvailabilityCalendarTest(TestCase):
+    def setUp(self):
+        clear_room_calendars()
+        self.user = CustomUser.objects.create(username="calendar", phone_number="+998901234567")
+        self.hotel = Hotel.objects.create(
+            name="Calendar Hotel", description="d", address="a", city="Nukus", country="Uzbekistan",
+            star_rating=3, phone="+998901234567", email="calendar@example.com",
+        )
+        room_type = RoomType.objects.create(name="Single", description="d")
+        self.rooms = [
+            Room.objects.create(
+                hotel=self.hotel, room_number=str(i), room_type=room_type, price_per_night=Decimal("40.00"),
+                capacity=1, floor=1, description="d",
+            )
+            for i in range(3)
+        ]
+        self.url = f"/hotel/hotels/{self.hotel.pk}/calendar/"
+
+    def book(self, room, check_in, check_out, status="confirmed"):
+        return Booking.objects.create(
+            room=room, user=self.user, check_in=check_in, check_out=check_out, guests_count=1,
+            total_price=Decimal("40.00"), status=status,
+        )
+
+    def busy(self, months=2):
+        response = self.client.get(self.url, {"start": "2030-01", "months": months})
+        return [[month["busy"] for month in room["months"]] for room in response.json()["rooms"]]
+
+    def test_runs_split_across_months_and_skip_inactive_bookings(self):
+        self.book(self.rooms[0], date(2030, 1, 30), date(2030, 2, 3))
+        self.book(self.rooms[0], date(2030, 2, 10), date(2030, 2, 12))
+        self.book(self.rooms[1], date(2030, 1, 5), date(2030, 1, 7), status="cancelled")
+        with self.assertNumQueries(2):
+            self.assertEqual(self.busy(), [[[[30, 2]], [[1, 2], [10, 2]]], [[], []], [[], []]])
+        with self.assertNumQueries(1):
+            self.busy()
+
+    def test_booking_changes_invalidate_cached_months(self):
+        booking = self.book(self.rooms[0], date(2030, 1, 1), date(2030, 1, 3))
+        self.assertEqual(self.busy(1), [[[[1, 2]]], [[]], [[]]])
+        booking.room = self.rooms[1]
+        booking.check_out = date(2030, 1, 4)
+        booking.save()
+        self.assertEqual(self.busy(1), [[[]], [[[1, 3]]], [[]]])
+        booking.delete()
+        self.assertEqual(self.busy(1), [[[]], [[]], [[]]])
+
+
+class AdminChangelistTest(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(username="admin", password="x", email="admin@example.com")
+        self.client.force_login(self.admin)
+        hotel = Hotel.objects.create(
+            name="Admin Inn", description="d", address="a", city="Khiva", country="UZ",
+            star_rating=3, phone="+998901234567", email="admin-inn@example.com",
+        )
+        self.room = Room.objects.create(
+            hotel=hotel, room_number="101", room_type=RoomType.objects.create(name="Single", description="d"),
+            price_per_night=Decimal("40.00"), capacity=1, floor=1, description="d",
+        )
+        for check_in in (date(2029, 12, 30), date(2030, 1, 5), date(2030, 1, 20), date(2030, 3, 1)):
+            Booking.objects.create(
+                room=self.room, user=self.admin, check_in=check_in, check_out=check_in + timedelta(days=2),
+                guests_count=1, total_price=Decimal("80.00"), status="confirmed",
+            )
+
+    def test_index_seek_dates_match_distinct_dates(self):
+        seek = IndexSeekQuerySet(Booking)
+        for kind in ("year", "month", "day"):
+            self.assertEqual(list(seek.dates("check_in", kind)), list(Booking.objects.dates("check_in", kind)))
+        in_2030 = seek.filter(check_in__year=2030)
+        self.assertEqual(list(in_2030.dates("check_in", "month")), [date(2030, 1, 1), date(2030, 3, 1)])
+
+    def test_count_is_capped_and_estimated(self):
+        paginator = EstimatedCountPaginator(Booking.objects.order_by("pk"), 2)
+        paginator.count_limit = 3
+        self.assertEqual(paginator.count, Booking.objects.order_by("-pk").values_list("pk", flat=True)[0])
+        paginator = EstimatedCountPaginator(Booking.objects.filter(status="confirmed").order_by("pk"), 2)
+        paginator.count_limit = 3
+        self.assertEqual(paginator.count, 3)
+
+    def test_changelists_render(self):
+        for url in ("/admin/hotel/booking/", "/admin/hotel/booking/?check_in__year=2030",
+                    "/admin/hotel/room/?q=101", "/admin/hotel/room/?q=Admin+Inn", "/admin/hotel/roomreview/"):
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+        self.assertContains(self.client.get("/admin/hotel/room/?q=Admin+Inn"), "Admin Inn #101")
@@ -1,15 +1,29 @@
 from django.urls import path
 
-from apps.hotel.views import room_detail_view, user_view, hotels_view, rooms_view, rooms_id_view, rooms_bookings_view
+from apps.hotel.async_views import room_async_view, room_detail_async_view, rooms_async_view
+from apps.hotel.views import room_detail_view, user_view, hotels_view, rooms_view, rooms_id_view, rooms_bookings_view, \
+    rooms_search_view, text_search_view, hotel_analytics_view, room_calendar_view, hotel_calendar_view, quotes_view, \
+    bookings_export_view, reviews_export_view
 
 app_name = 'hotel'
 
 urlpatterns = [
     path('register/',user_view),
     path('hotels/',hotels_view),
+    path('hotels/<int:pk>/analytics/', hotel_analytics_view),
+    path('hotels/<int:pk>/calendar/', hotel_calendar_view),
     path('rooms/', rooms_view),
+    path('rooms/search/', rooms_search_view),
     path('rooms/<int:pk>/', rooms_id_view),
     path('rooms-detail/<int:pk>/', room_detail_view),
     path('rooms/<int:pk>/bookings/', rooms_bookings_view),
+    path('rooms/<int:pk>/calendar/', room_calendar_view),
+    path('search/', text_search_view),
+    path('quotes/', quotes_view),
+    path('exports/bookings/', bookings_export_view),
+    path('exports/reviews/', reviews_export_view),
+    path('async/rooms/', rooms_async_view),
+    path('async/rooms/<int:pk>/', room_async_view),
+    path('async/rooms-detail/<int:pk>/', room_detail_async_view),
 
 ]
\ No newline at end of file
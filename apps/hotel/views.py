@@ -1,8 +1,25 @@
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Prefetch, Q
+from django.utils.http import parse_etags
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-from apps.hotel.models import CustomUser, Room
-from apps.hotel.serializer import RegisterSerializer, HotelsSerializer, RoomDetailSerializer, RoomSerializer, RoomsBookingsSerializer
+from apps.hotel.analytics import daily_hotel_metrics
+from apps.hotel.availability import available_rooms
+from apps.hotel.cache import get_room_detail, set_room_detail
+from apps.hotel.calendars import room_calendars
+from apps.hotel.exports import bookings_export, reviews_export
+from apps.hotel.models import CustomUser, Hotel, Room, RoomReview
+from apps.hotel.pagination import RoomCursorPagination
+from apps.hotel.pricing import PRICE_FIELDS, quote_stays
+from apps.hotel.search import SEARCH_KINDS, search
+from apps.hotel.serializer import RegisterSerializer, HotelsSerializer, RoomDetailSerializer, RoomSerializer, RoomsBookingsSerializer, RoomSearchSerializer, \
+    AnalyticsRangeSerializer, QuoteRequestSerializer, QuoteSerializer, ExportFilterSerializer, TextSearchSerializer, \
+    CalendarRangeSerializer
+
+from core.fast_serializers import fast_serializer
 
 
 @api_view(["GET", "POST"])
@@ -27,7 +44,13 @@ def hotels_view(request):
 
 @api_view(["GET", "POST"])
 def rooms_view(request):
-    serializer = RoomSerializer(data=request.data)
+    if request.method == "GET":
+        rooms = RoomSerializer.setup_eager_loading(Room.objects.all())
+        paginator = RoomCursorPagination()
+        page = paginator.paginate_queryset(rooms, request)
+        return paginator.get_paginated_response(fast_serializer(RoomSerializer).many(page))
+
+    serializer = RoomSerializer(data=request.data, many=isinstance(request.data, list))
     if serializer.is_valid():
         serializer.save()
         return Response(data=serializer.data, status=status.HTTP_201_CREATED)
@@ -37,13 +60,12 @@ def rooms_view(request):
 @api_view(["GET", "PATCH"])
 def rooms_id_view(request, pk):
     try:
-        room = Room.objects.get(id=pk)
+        room = RoomSerializer.setup_eager_loading(Room.objects.all()).get(id=pk)
     except Room.DoesNotExist:
         return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
 
     if request.method == "GET":
-        serializer = RoomSerializer(room)
-        return Response(serializer.data)
+        return Response(fast_serializer(RoomSerializer)(room))
 
     if request.method == "PATCH":
         serializer = RoomSerializer(room, data=request.data, partial=True)
@@ -78,10 +100,153 @@ def rooms_bookings_view(request, pk):
 
 @api_view(["GET"])
 def room_detail_view(request, pk):
+    cached = get_room_detail(pk)
+    if cached is None:
+        try:
+            room = Room.objects.select_related("hotel", "room_type").prefetch_related(
+                "amenities", Prefetch("reviews", queryset=RoomReview.objects.select_related("user"))
+            ).get(pk=pk)
+        except Room.DoesNotExist:
+            return Response({"error": "Room not found"}, status=404)
+        cached = set_room_detail(pk, fast_serializer(RoomDetailSerializer)(room))
+
+    etag, data = cached
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return Response(data, headers={"ETag": etag})
+
+
+@api_view(["GET"])
+def rooms_search_view(request):
+    params = RoomSearchSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    filters = params.validated_data
+
+    rooms = Room.objects.filter(status="available", capacity__gte=filters["guests"])
+    if filters.get("city"):
+        rooms = rooms.filter(hotel__city__iexact=filters["city"])
+    if filters.get("country"):
+        rooms = rooms.filter(hotel__country__iexact=filters["country"])
+
+    amenities = set(filters["amenities"])
+    if amenities:
+        rooms = rooms.annotate(
+            matched_amenities=Count("amenities", filter=Q(amenities__in=amenities), distinct=True)
+        ).filter(matched_amenities=len(amenities))
+
+    rooms = available_rooms(rooms, filters["check_in"], filters["check_out"])
+    rooms = rooms.annotate(
+        final_price_value=ExpressionWrapper(
+            F("price_per_night") * (Decimal("100") - F("discount_percentage")) / Decimal("100"),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        )
+    ).order_by("final_price_value", "id")
+    rooms = RoomSerializer.setup_eager_loading(rooms)[:filters["limit"]]
+
+    return Response(fast_serializer(RoomSerializer).many(rooms))
+
+
+@api_view(["GET"])
+def text_search_view(request):
+    params = TextSearchSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = params.validated_data
+    kinds = [kind for kind in SEARCH_KINDS if kind in (data.get("type") or SEARCH_KINDS)]
+
     try:
-        room = Room.objects.get(pk=pk)
-    except Room.DoesNotExist:
-        return Response({"error": "Room not found"}, status=404)
+        results = search(data["q"], kinds, data["limit"])
+    except RuntimeError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    return Response({"query": data["q"], **results})
+
+
+@api_view(["GET"])
+def room_calendar_view(request, pk):
+    params = CalendarRangeSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    if not Room.objects.filter(pk=pk).exists():
+        return Response({"error": "Room not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    start, months = params.validated_data["start"], params.validated_data["months"]
+    [calendar] = room_calendars([pk], start, months)
+    return Response({"start": f"{start:%Y-%m}", **calendar})
+
 
-    serializer = RoomDetailSerializer(room)
-    return Response(serializer.data)
+@api_view(["GET"])
+def hotel_calendar_view(request, pk):
+    params = CalendarRangeSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    room_ids = list(Room.objects.filter(hotel_id=pk).order_by("id").values_list("id", flat=True))
+    if not room_ids and not Hotel.objects.filter(pk=pk).exists():
+        return Response({"error": "Hotel not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    start, months = params.validated_data["start"], params.validated_data["months"]
+    return Response({"hotel": pk, "start": f"{start:%Y-%m}", "rooms": room_calendars(room_ids, start, months)})
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def hotel_analytics_view(request, pk):
+    if not Hotel.objects.filter(pk=pk).exists():
+        return Response({"error": "Hotel not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    params = AnalyticsRangeSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        metrics = daily_hotel_metrics(pk, params.validated_data["start"], params.validated_data["end"])
+    except RuntimeError as exc:
+        return Response({"error": str(exc)}, status=status.HTTP_501_NOT_IMPLEMENTED)
+    return Response(metrics)
+
+
+@api_view(["POST"])
+def quotes_view(request):
+    params = QuoteRequestSerializer(data=request.data)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = params.validated_data
+
+    if "stays" in data:
+        quotes = quote_stays((stay["room"], stay["check_in"], stay["check_out"]) for stay in data["stays"])
+    else:
+        rooms = Room.objects.only(*PRICE_FIELDS)
+        if data.get("hotel"):
+            rooms = rooms.filter(hotel_id=data["hotel"])
+        if data.get("city"):
+            rooms = rooms.filter(hotel__city__iexact=data["city"])
+        if data.get("rooms"):
+            rooms = rooms.filter(id__in=data["rooms"])
+        limit = QuoteRequestSerializer.MAX_STAYS
+        rooms = {room.pk: room for room in rooms.order_by("id")[:limit + 1]}
+        if len(rooms) > limit:
+            return Response(
+                {"error": f"More than {limit} rooms match; narrow the filter with hotel or rooms"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        quotes = quote_stays(((room_id, data["check_in"], data["check_out"]) for room_id in rooms), rooms=rooms)
+
+    return Response(fast_serializer(QuoteSerializer).many(quotes))
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def bookings_export_view(request):
+    params = ExportFilterSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    return bookings_export(params.validated_data)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def reviews_export_view(request):
+    params = ExportFilterSerializer(data=request.query_params)
+    if not params.is_valid():
+        return Response(params.errors, status=status.HTTP_400_BAD_REQUEST)
+    return reviews_export(params.validated_data)
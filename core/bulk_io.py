@@ -0,0 +1,31 @@
+"""Reading and chunking helpers shared by the bulk import commands."""
+import csv
+from itertools import islice
+
+
+# Ids per IN (...) or OR'ed lookup, well under SQLite's bound-parameter limit.
+ID_CHUNK = 500
+
+
+def chunked(values, size):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def read_rows(path, fmt):
+    """Yield ``(line_no, row)`` from a CSV file (dict rows) or JSONL file (raw lines)."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if fmt == "csv":
+            for line_no, row in enumerate(csv.DictReader(handle), start=2):
+                yield line_no, row
+        else:
+            for line_no, line in enumerate(handle, start=1):
+                if line.strip():
+                    yield line_no, line
@@ -0,0 +1,30 @@
+"""Helpers for the named caches configured by ``shared_cache`` in settings."""
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+
+
+DELETE_BATCH = 500
+
+
+def clear_cache(alias):
+    """Drop every entry of one cache, leaving other data in its backend alone.
+
+    ``RedisCache.clear()`` runs ``FLUSHDB``, which would also wipe any other
+    cache or data sharing the database, so Redis entries are found with
+    ``SCAN`` on the cache's key prefix and deleted in batches.
+    """
+    cache = caches[alias]
+    if not isinstance(cache, RedisCache):
+        cache.clear()
+        return
+    if not cache.key_prefix:
+        raise ValueError(f"Cache {alias!r} needs a KEY_PREFIX to be cleared by prefix")
+    client = cache._cache.get_client(write=True)
+    batch = []
+    for key in client.scan_iter(match=f"{cache.key_prefix}:*", count=DELETE_BATCH):
+        batch.append(key)
+        if len(batch) >= DELETE_BATCH:
+            client.delete(*batch)
+            batch = []
+    if batch:
+        client.delete(*batch)
@@ -0,0 +1,165 @@
+"""Compiled read-only rendering for DRF serializers on hot GET paths.
+
+``fast_serializer(SomeSerializer)`` inspects the serializer's fields once
+and returns a ``CompiledSerializer`` that turns model instances (or
+``.values()`` rows) into the same dicts ``SomeSerializer(obj).data``
+would, without re-running DRF's per-field ``get_attribute`` /
+``to_representation`` dispatch or re-instantiating nested serializers.
+
+Serializers that post-process their output should do it in a
+``finalize_representation(self, instance, data)`` method called from
+``to_representation``; the compiled renderer calls the same method.
+"""
+
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import relations, serializers
+from rest_framework.fields import empty, is_simple_callable
+
+
+_SKIP = object()
+
+VALUE, METHOD, NESTED, NESTED_MANY, PK, PK_MANY = range(6)
+
+
+_simple_callables = {}
+
+
+def _resolve(instance, attrs):
+    for attr in attrs:
+        owner = type(instance)
+        try:
+            instance = instance[attr] if isinstance(instance, dict) else getattr(instance, attr)
+        except ObjectDoesNotExist:
+            return None
+        if callable(instance):
+            # Whether ``owner.attr`` is a zero-argument callable is a property of
+            # the class, so inspect.signature() only runs once per attribute.
+            key = (owner, attr)
+            simple = _simple_callables.get(key)
+            if simple is None:
+                simple = _simple_callables[key] = is_simple_callable(instance)
+            if simple:
+                instance = instance()
+    return instance
+
+
+def _missing(field):
+    if field.default is not empty:
+        return field.get_default()
+    if field.allow_null:
+        return None
+    if not field.required:
+        return _SKIP
+    return None
+
+
+def _converter(field):
+    if type(field) is serializers.IntegerField:
+        return int
+    if type(field) is serializers.CharField:
+        return str
+    return field.to_representation
+
+
+class CompiledSerializer:
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.plan = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            self.plan.append(self._compile_field(name, field))
+        self.has_finalize = hasattr(serializer_class, "finalize_representation")
+        self._default_render = None
+
+    @staticmethod
+    def _compile_field(name, field):
+        attrs = tuple(field.source_attrs)
+        if isinstance(field, serializers.SerializerMethodField):
+            return name, METHOD, attrs, field.method_name, field
+        if isinstance(field, serializers.ListSerializer):
+            return name, NESTED_MANY, attrs, fast_serializer(type(field.child)), field
+        if isinstance(field, serializers.BaseSerializer):
+            return name, NESTED, attrs, fast_serializer(type(field)), field
+        if isinstance(field, relations.ManyRelatedField):
+            return name, PK_MANY, attrs, None, field
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            return name, PK, attrs, None, field
+        return name, VALUE, attrs, _converter(field), field
+
+    def bind(self, context=None):
+        """Return a ``render(instance) -> dict`` function for one context."""
+        serializer = self.serializer_class(context=context or {})
+        steps = []
+        for name, kind, attrs, extra, field in self.plan:
+            if kind == METHOD:
+                extra = getattr(serializer, extra)
+            elif kind in (NESTED, NESTED_MANY):
+                extra = extra.renderer(context)
+            steps.append((name, kind, attrs, extra, field))
+        finalize = serializer.finalize_representation if self.has_finalize else None
+
+        def render(instance):
+            data = {}
+            for name, kind, attrs, extra, field in steps:
+                if kind == METHOD:
+                    data[name] = extra(instance)
+                    continue
+                try:
+                    if kind == PK and not isinstance(instance, dict):
+                        owner = _resolve(instance, attrs[:-1])
+                        value = owner.serializable_value(attrs[-1])
+                    else:
+                        value = _resolve(instance, attrs)
+                except (AttributeError, KeyError):
+                    value = _missing(field)
+                    if value is _SKIP:
+                        continue
+                    data[name] = value
+                    continue
+
+                if kind == PK_MANY:
+                    if getattr(instance, "pk", True) is None:
+                        value = []
+                    elif hasattr(value, "all"):
+                        value = value.all()
+                    data[name] = [item.pk for item in value]
+                elif value is None:
+                    data[name] = None
+                elif kind == VALUE:
+                    data[name] = extra(value)
+                elif kind == PK:
+                    data[name] = value
+                elif kind == NESTED:
+                    data[name] = extra(value)
+                else:
+                    data[name] = [extra(item) for item in (value.all() if hasattr(value, "all") else value)]
+            if finalize is not None:
+                return finalize(instance, data)
+            return data
+
+        return render
+
+    def renderer(self, context=None):
+        if context:
+            return self.bind(context)
+        if self._default_render is None:
+            self._default_render = self.bind()
+        return self._default_render
+
+    def __call__(self, instance, context=None):
+        return self.renderer(context)(instance)
+
+    def many(self, instances, context=None):
+        render = self.renderer(context)
+        return [render(instance) for instance in instances]
+
+
+_compiled = {}
+
+
+def fast_serializer(serializer_class):
+    compiled = _compiled.get(serializer_class)
+    if compiled is None:
+        compiled = _compiled[serializer_class] = CompiledSerializer(serializer_class)
+    return compiled
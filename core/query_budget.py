@@ -0,0 +1,121 @@
+"""Per-request SQL accounting and query budgets.
+
+``QueryBudgetMiddleware`` records every query a request runs through
+``connection.execute_wrapper`` (so it works with ``DEBUG = False``),
+adds ``X-Query-*`` headers when ``DEBUG`` is on and logs views that go
+over their budget. It runs in both sync and async stacks, so it doesn't
+force an ASGI request through a thread when it sits first in
+``MIDDLEWARE``. Budgets come from ``settings.QUERY_BUDGETS``, keyed by
+dotted view path, falling back to ``settings.QUERY_BUDGET_DEFAULT``.
+
+``query_budget(n)`` is the test-side counterpart: a context manager that
+fails when the block runs more than ``n`` queries and lists repeated
+statements, which is what an N+1 looks like.
+"""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(duration for _, duration in self.queries)
+
+    def duplicates(self):
+        """Statements (with placeholders, so one per query shape) run more than once."""
+        counts = Counter(sql for sql, _ in self.queries)
+        return {sql: count for sql, count in counts.most_common() if count > 1}
+
+
+@contextmanager
+def record_queries():
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        yield recorder
+
+
+def budget_for(view_path):
+    budgets = getattr(settings, "QUERY_BUDGETS", {})
+    return budgets.get(view_path, getattr(settings, "QUERY_BUDGET_DEFAULT", None))
+
+
+class QueryBudgetMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        # Connections are per thread, and sync views and the async ORM query
+        # from the request's sync_to_async thread, so the recorder goes there.
+        recorder = QueryRecorder()
+        await sync_to_async(lambda: connection.execute_wrappers.append(recorder))()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(lambda: connection.execute_wrappers.remove(recorder))()
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        match = getattr(request, "resolver_match", None)
+        view_path = match._func_path if match else request.path
+        budget = budget_for(view_path)
+        duplicates = recorder.duplicates()
+
+        if settings.DEBUG:
+            response["X-Query-Count"] = str(recorder.count)
+            response["X-Query-Time-Ms"] = f"{recorder.total_time * 1000:.2f}"
+            response["X-Query-Duplicates"] = str(sum(duplicates.values()) - len(duplicates))
+
+        if budget is not None and recorder.count > budget:
+            logger.warning(
+                "%s %s ran %d queries (budget %d, %.1fms); repeated: %s",
+                request.method, view_path, recorder.count, budget, recorder.total_time * 1000,
+                "; ".join(f"{count}x {sql[:120]}" for sql, count in list(duplicates.items())[:3]) or "none",
+            )
+        return response
+
+
+@contextmanager
+def query_budget(budget):
+    with record_queries() as recorder:
+        yield recorder
+    if recorder.count > budget:
+        repeated = "\n".join(f"  {count}x {sql}" for sql, count in recorder.duplicates().items())
+        raise AssertionError(
+            f"{recorder.count} queries executed, budget is {budget}"
+            + (f"\nRepeated statements:\n{repeated}" if repeated else "")
+        )
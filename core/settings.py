@@ -10,7 +10,9 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
+from urllib.parse import urlsplit
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -47,6 +49,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.query_budget.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -58,6 +61,23 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "core.urls"
 
+TEST_RUNNER = "core.test_runner.TestRunner"
+
+# Query budgets enforced by core.query_budget.QueryBudgetMiddleware, keyed by
+# dotted view path. Requests over budget are logged as warnings.
+QUERY_BUDGET_DEFAULT = 20
+QUERY_BUDGETS = {
+    "apps.hotel.views.room_detail_view": 4,
+    "apps.hotel.views.rooms_id_view": 2,
+    "apps.hotel.views.room_calendar_view": 2,
+    "apps.hotel.views.hotel_calendar_view": 2,
+    "apps.blogs.views.post_detail_view": 8,
+    "apps.blogs.views.post_feed_view": 6,
+    "apps.blogs.views.post_comments_view": 6,
+    # Day level of a date hierarchy: one index seek per day with data.
+    "django.contrib.admin.options.changelist_view": 40,
+}
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -87,6 +107,48 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Cached room details are dropped on every write, but a LocMemCache lives in one
+# process: with several workers, an invalidation never reaches the others. Set
+# REDIS_URL to share these caches between workers; without it entries expire
+# after LOCAL_CACHE_TIMEOUT seconds, which bounds how stale another worker can be.
+# On Redis each cache gets its own database, and its entries expire after
+# REDIS_CACHE_TIMEOUT seconds. Calendar months filed under a retired generation
+# token are never deleted, so the TTL is the only thing that removes them.
+# MAX_ENTRIES has no Redis counterpart: cap the server with maxmemory and a
+# volatile-lru eviction policy.
+REDIS_URL = os.environ.get("REDIS_URL")
+LOCAL_CACHE_TIMEOUT = 60
+REDIS_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def shared_cache(name, max_entries, redis_db):
+    if REDIS_URL:
+        return {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": urlsplit(REDIS_URL)._replace(path=f"/{redis_db}").geturl(),
+            "KEY_PREFIX": name,
+            "TIMEOUT": REDIS_CACHE_TIMEOUT,
+        }
+    return {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": name,
+        "TIMEOUT": LOCAL_CACHE_TIMEOUT,
+        "OPTIONS": {"MAX_ENTRIES": max_entries},
+    }
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "room_detail": shared_cache("room-detail", 5000, redis_db=1),
+    "availability_calendar": shared_cache("availability-calendar", 100000, redis_db=2),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 